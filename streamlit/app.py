@@ -1,9 +1,16 @@
-import streamlit as st
-import pandas as pd
-import base64
 import time
-import requests
-from bs4 import BeautifulSoup
+
+import streamlit as st
+# Seuls les noms légers sont importés ici : pandas, requests et bs4 sont chargés au
+# premier scraping ou au premier affichage de données, pas au démarrage
+from scraper import (
+    COUNTERS, DEFAULT_CONCURRENCY, DEFAULT_DETAIL_CONCURRENCY, DEFAULT_DETAIL_RATE, DEFAULT_RATE, DEFAULT_WORKERS,
+    LISTINGS_PER_PAGE, MAX_DETAIL_CONCURRENCY, MOTORCYCLES, RENTALS, VEHICLES, Metrics,
+)
+from app_data import (
+    clean_webscraper_data, export_dataset, listing_store, load_dashboard_charts, load_dashboard_dataset,
+    load_job_result, load_webscraper_data, parse_pool, query_store_charts, query_store_listings,
+)
 
 # configuration de la page
 st.set_page_config(
@@ -27,12 +34,38 @@ st.sidebar.header("Fonctionnalités supplémentaires")
 st.sidebar.subheader("Pages indexes")
 selected_pages = st.sidebar.selectbox("", [1, 2, 3, 4, 5], index=1)
 
+# Réglages du moteur de récupération
+st.sidebar.subheader("Performance")
+fetch_concurrency = st.sidebar.slider("Requêtes simultanées", 1, 8, DEFAULT_CONCURRENCY)
+fetch_rate = st.sidebar.slider("Requêtes par seconde", 0.5, 10.0, DEFAULT_RATE, step=0.5)
+use_http_cache = st.sidebar.checkbox("Utiliser le cache HTTP", value=True)
+parse_workers = st.sidebar.slider("Processus de parsing (0 = sur place)", 0, 8, DEFAULT_WORKERS)
+incremental_mode = st.sidebar.checkbox("Mode incrémental (nouvelles annonces seulement)", value=False)
+fetch_details = st.sidebar.checkbox("Pages de détail (caractéristiques complètes)", value=False)
+detail_concurrency = DEFAULT_DETAIL_CONCURRENCY
+detail_rate = DEFAULT_DETAIL_RATE
+if fetch_details:
+    detail_concurrency = st.sidebar.slider("Requêtes simultanées (pages de détail)", 1, MAX_DETAIL_CONCURRENCY,
+                                           DEFAULT_DETAIL_CONCURRENCY)
+    # Par défaut, de quoi suivre les pages de liste (une page de détail par annonce)
+    detail_rate = st.sidebar.slider("Requêtes par seconde (pages de détail)", 1.0, LISTINGS_PER_PAGE * 10.0,
+                                    LISTINGS_PER_PAGE * fetch_rate, step=1.0)
+    # Les deux limites s'additionnent : c'est la charge réelle vue par le site
+    st.sidebar.caption(f"Charge maximale sur le site : {fetch_rate + detail_rate:g} requêtes par seconde.")
+
+# Options de scraping communes (interface et tâches en arrière-plan)
+def scrape_options():
+    return dict(concurrency=fetch_concurrency, rate=fetch_rate, use_cache=use_http_cache,
+                workers=parse_workers, incremental=incremental_mode, details=fetch_details,
+                detail_concurrency=detail_concurrency, detail_rate=detail_rate)
+
 # Options
 st.sidebar.subheader("Options")
 scraping_options = [
     "Scraper des données avec beautifulSoup",
     "Scraper des données avec Web Scraper",
     "Tableau de bord des données",
+    "Tâches de scraping en arrière-plan",
     "Remplir le formulaire"
 ]
 selected_option = st.sidebar.selectbox("", scraping_options)
@@ -43,175 +76,107 @@ st.title("MY DATA SCRAPER APP")
 st.markdown("""
 Cette application permet de scrapper des données de véhicules, motos et locations de voitures à partir du site dakar-auto.com en utilisant beautifulsoup et web scraper.
 
-• **Librairies Python :** base64, pandas, streamlit, requests, bs4  
+• **Librairies Python :** pandas, streamlit, requests, bs4, lxml  
 • **Data source :** dakar-auto.com
 """)
 
-# Fonction pour créer un lien de téléchargement
-def create_download_link(df, filename):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Télécharger sous format CSV</a>'
-    return href
-
-# Fonction de scrappage pour le site d'achats devéhicules
-def scrape_vehicles_data(max_pages):
-    data = []
+# Fonction pour créer les boutons de téléchargement (CSV, CSV gzip, Parquet) ; le
+# fichier n'est généré qu'au clic
+def render_downloads(df, basename):
+    from scraper import EXPORT_FORMATS, dataset_hash
+
+    digest = dataset_hash(df)
+    columns = st.columns(len(EXPORT_FORMATS))
+    for column, (fmt, (extension, mime)) in zip(columns, EXPORT_FORMATS.items()):
+        with column:
+            st.download_button(
+                f"Télécharger sous format {fmt}",
+                data=lambda fmt=fmt: export_dataset(df, digest, fmt),
+                file_name=f"{basename}.{extension}",
+                mime=mime,
+                key=f"download_{basename}_{extension}",
+                on_click="ignore",
+            )
+
+# Panneau des métriques d'un scraping (compteurs et durées par étape)
+def render_metrics(snapshot):
+    import pandas as pd
+
+    empty = snapshot['counters'].get('details_empty', 0)
+    if empty:
+        st.warning(f"{empty} page(s) de détail sans caractéristiques reconnues : "
+                   "la structure des pages d'annonces a peut-être changé.")
+    with st.expander("Métriques du scraping", expanded=False):
+        counters = snapshot['counters']
+        columns = st.columns(3)
+        for i, (name, label) in enumerate(COUNTERS.items()):
+            columns[i % 3].metric(label, f"{counters.get(name, 0):,}".replace(',', ' '))
+        stages = pd.DataFrame(snapshot['stages']).T
+        durations = ['sum', 'mean', 'p50', 'p95', 'max']
+        stages[durations] = stages[durations].astype(float) * 1000
+        st.dataframe(stages.rename(columns={'count': 'mesures', 'sum': 'total (ms)', 'mean': 'moyenne (ms)',
+                                            'p50': 'p50 (ms)', 'p95': 'p95 (ms)', 'max': 'max (ms)'}),
+                     use_container_width=True)
+
+# Aperçu en cours de scraping : nombre de lignes affichées et délai minimal entre deux rendus (s)
+PREVIEW_ROWS = 200
+PREVIEW_INTERVAL = 1.0
+
+# Fonction de scrappage générique : les pages sont récupérées en parallèle, parsées
+# par le pool de processus et affichées au fur et à mesure, dans l'ordre des pages
+def scrape_listings(schema, max_pages):
+    from scraper import page_messages, scrape
+
+    parse_pool(parse_workers)
     progress_bar = st.progress(0)
     status_text = st.empty()
-    
-    for p in range(1, max_pages + 1):
-        status_text.text(f'Scraping page {p}/{max_pages}...')
-        progress_bar.progress(p / max_pages)
-        
-        try:
-            url = f"https://dakar-auto.com/senegal/voitures-4?&page={p}"
-            content = requests.get(url)
-
-            if content.status_code != 200: 
-                st.warning(f"Page {p} est indisponible.")
-                continue 
-            
-            st.write(f"Page {p} a été scrappée.")
-            soup = BeautifulSoup(content.text, 'html.parser')
-            containers = soup.find_all('div', class_="listings-cards__list-item mb-md-3 mb-3")
-            
-            for container in containers: 
-                try:
-                    marque = container.find('h2', class_="listing-card__header__title mb-md-2 mb-0").get_text(strip=True)
-                    prix = container.find('h3', class_="listing-card__header__price font-weight-bold text-uppercase mb-0").get_text(strip=True).replace('\u202f', ' ')
-                    adresse_1 = container.find('span', class_="province font-weight-bold d-inline-block").get_text(strip=True)
-                    li_tags = container.find_all('li', class_="listing-card__attribute list-inline-item")
-
-                    kilometrage = li_tags[1].get_text(strip=True) if len(li_tags) > 1 else "---"
-                    boite_vitesse = li_tags[2].get_text(strip=True) if len(li_tags) > 2 else "---"
-                    type_carburant = li_tags[3].get_text(strip=True) if len(li_tags) > 3 else "---"
-
-                    proprietaire_tag = container.find('p', class_="time-author m-0")
-                    proprietaire = proprietaire_tag.get_text(strip=True).strip("Par ") if proprietaire_tag else "---"
-
-                    data.append({
-                        'marque': marque.split(' ')[0],
-                        'année': marque.split(' ')[2] if len(marque.split(' ')) > 2 and marque.split(' ')[2].isnumeric() else "---",
-                        'prix': prix,
-                        'adresse': adresse_1,
-                        'kilométrage': kilometrage,
-                        'boite vitesse': boite_vitesse,
-                        'carburant': type_carburant, 
-                        'propriétaire': proprietaire
-                    })
-                except Exception as e: 
-                    st.error(f"Erreur lors du scraping d'un véhicule: {e}")
-                    pass
-        except Exception as e:
-            st.error(f"Erreur lors du scraping de la page {p}: {e}")
-            continue
-        
-        time.sleep(1)
-    
+    detail_bar = st.progress(0, text="Pages de détail") if fetch_details else None
+    table = st.empty()
+    last_draw = 0.0
+
+    def on_page(page, done, total, buffer):
+        nonlocal last_draw
+        progress_bar.progress(done / total)
+        status_text.text(f'Page {page.key} traitée ({done}/{total})...')
+        for level, text in page_messages(schema, page):
+            if level == 'info':
+                st.write(text)
+            elif level == 'warning':
+                st.warning(text)
+            else:
+                st.error(text)
+        # Aperçu limité aux dernières lignes et redessiné au plus une fois par intervalle :
+        # le coût par page ne croît pas avec la taille du scraping
+        now = time.monotonic()
+        if page.rows and now - last_draw >= PREVIEW_INTERVAL:
+            last_draw = now
+            table.dataframe(buffer.to_frame(last=PREVIEW_ROWS), use_container_width=True)
+
+    # Les pages de détail se terminent après la dernière page de liste : progression à part
+    def on_detail(done, total):
+        detail_bar.progress(done / total if total else 0.0, text=f"Pages de détail : {done}/{total}")
+
+    status_text.text(f'Scraping de {max_pages} pages...')
+    metrics = Metrics()
+    df = scrape(schema, 1, max_pages, on_page=on_page, metrics=metrics, on_detail=on_detail if fetch_details else None,
+                **scrape_options())
+    progress_bar.progress(1.0)
     status_text.text('Scraping terminé!')
-    return pd.DataFrame(data)
+    table.empty()
+    render_metrics(metrics.snapshot())
+    return df
 
-# Fonction de scrappage pour le site ded'achats de motos
-def scrape_motorcycle_data(max_pages):
-    data = []
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for p in range(1, max_pages + 1):
-        status_text.text(f'Scraping page {p}/{max_pages}...')
-        progress_bar.progress(p / max_pages)
-        
-        try:
-            url = f"https://dakar-auto.com/senegal/motos-and-scooters-3?&page={p}"
-            content = requests.get(url)
+# Fonction de scrappage pour le site d'achats de véhicules
+def scrape_vehicles_data(max_pages):
+    return scrape_listings(VEHICLES, max_pages)
 
-            if content.status_code != 200: 
-                st.warning(f"Page {p} est indisponible.")
-                continue 
-            
-            st.write(f"Page {p} a été scrappée.")
-            soup = BeautifulSoup(content.text, 'html.parser')
-            containers = soup.find_all('div', class_="listing-card__content__inner")
-            
-            for container in containers: 
-                try:
-                    product_title_tag = container.find('h2', class_="listing-card__header__title mb-md-2 mb-0").get_text(strip=True)
-                    prix = container.find('h3', class_="listing-card__header__price font-weight-bold text-uppercase mb-0").get_text(strip=True).replace('\u202f', ' ')
-                    adresse_1 = container.find('span', class_="town-suburb d-inline-block").get_text(strip=True)
-                    adresse_2 = container.find('span', class_="province font-weight-bold d-inline-block").get_text(strip=True)
-                    kilometrage = container.find_all('li', class_="listing-card__attribute list-inline-item")
-                    proprietaire = container.find('p', class_="time-author m-0").get_text(strip=True).strip('Par')
-                    
-                    data.append({
-                        'marque': product_title_tag.split(' ')[0],
-                        'annee': product_title_tag.split(' ')[-1],
-                        'prix': prix,
-                        'adresse': f"{adresse_1}, {adresse_2}",
-                        'kilometrage': kilometrage[1].get_text(strip=True) if len(kilometrage) > 1 else "---",
-                        'proprietaire': proprietaire
-                    })
-                except Exception as e: 
-                    st.error(f"Erreur lors du scraping d'une moto: {e}")
-                    pass
-        except Exception as e:
-            st.error(f"Erreur lors du scraping de la page {p}: {e}")
-            continue
-        
-        time.sleep(1)
-    
-    status_text.text('Scraping terminé!')
-    return pd.DataFrame(data)
+# Fonction de scrappage pour le site d'achats de motos
+def scrape_motorcycle_data(max_pages):
+    return scrape_listings(MOTORCYCLES, max_pages)
 
 # Fonction de scrappage pour le site de location
 def scrape_rentals_data(max_pages):
-    data = []
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for p in range(1, max_pages + 1):
-        status_text.text(f'Scraping page {p}/{max_pages}...')
-        progress_bar.progress(p / max_pages)
-        
-        try:
-            url = f"https://dakar-auto.com/senegal/location-de-voitures-19?&page={p}"
-            content = requests.get(url)
-
-            if content.status_code != 200: 
-                st.warning(f"Page {p} est indisponible.")
-                continue 
-            
-            st.write(f"Page {p} a été scrappée.")
-            soup = BeautifulSoup(content.text, 'html.parser')
-            containers = soup.find_all('div', class_="listing-card__content__inner")
-            
-            for container in containers: 
-                try:
-                    marque = container.find('h2', class_="listing-card__header__title mb-md-2 mb-0").get_text(strip=True)
-                    prix = container.find('h3', class_="listing-card__header__price font-weight-bold text-uppercase mb-0").get_text(strip=True).replace('\u202f', ' ')
-                    adresse_1 = container.find('span', class_="town-suburb d-inline-block").get_text(strip=True)
-                    adresse_2 = container.find('span', class_="province font-weight-bold d-inline-block").get_text(strip=True)   
-                    proprietaire = container.find('p', class_="time-author m-0").get_text(strip=True)
-                    
-                    data.append({
-                        'marque': marque.split(' ')[0] if marque else "---",
-                        'annee': marque.split(' ')[-1] if marque and len(marque.split(' ')) > 1 else "---",
-                        'prix': prix,
-                        'adresse': f"{adresse_1}, {adresse_2}",
-                        'proprietaire': proprietaire
-                    })
-                except Exception as e: 
-                    st.error(f"Erreur lors du scraping d'une location: {e}")
-                    pass
-        except Exception as e:
-            st.error(f"Erreur lors du scraping de la page {p}: {e}")
-            continue
-        
-        
-        time.sleep(1)
-    
-    status_text.text('Scraping terminé!')
-    return pd.DataFrame(data)
+    return scrape_listings(RENTALS, max_pages)
 
 # Les boutons principaux
 col1, col2, col3 = st.columns(3)
@@ -227,21 +192,25 @@ with col1:
             if not df_vehicles.empty:
                 st.success(f"Scrappage réussi de {len(df_vehicles)} véhicules depuis {selected_pages} pages!")
                 st.dataframe(df_vehicles, use_container_width=True)
-                st.markdown(create_download_link(df_vehicles, "vehicles_data.csv"), unsafe_allow_html=True)
+                render_downloads(df_vehicles, "vehicles_data")
                 st.session_state['vehicles_data'] = df_vehicles
             else:
                 st.warning("Aucune donnée de véhicule trouvée.")
 
         elif selected_option == "Scraper des données avec Web Scraper":
             st.subheader("Téléchargement des données Web Scraper (non nettoyées)")
-            
+            from scraper import WEBSCRAPER_FILES, file_version
+
             with st.spinner("Chargement des données Web Scraper..."):
-                time.sleep(2) 
                 try:
-                    df_raw_webscraper = pd.read_csv("C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\dakar-auto.csv")
+                    path = WEBSCRAPER_FILES['vehicles']
+                    version = file_version(path)
+                    df_raw_webscraper = load_webscraper_data(path, version)
                     st.success(f"{len(df_raw_webscraper)} lignes chargées depuis Web Scraper.")
                     st.dataframe(df_raw_webscraper)
-                    st.markdown(create_download_link(df_raw_webscraper, "dakar-auto.csv"), unsafe_allow_html=True)
+                    render_downloads(df_raw_webscraper, "dakar-auto")
+                    with st.expander("Aperçu des données nettoyées"):
+                        st.dataframe(clean_webscraper_data(path, version), use_container_width=True)
                 except FileNotFoundError:
                     st.error("Fichier non trouvé. Assurez-vous d'avoir placé 'dakar-auto.csv' dans le dossier /data.")
 
@@ -250,7 +219,7 @@ with col1:
             if st.session_state['vehicles_data'] is not None and not st.session_state['vehicles_data'].empty:
                 st.subheader("Telechargement des données de véhicules")
                 st.dataframe(st.session_state['vehicles_data'], use_container_width=True)
-                st.markdown(create_download_link(st.session_state['vehicles_data'], "vehicles_data.csv"), unsafe_allow_html=True)
+                render_downloads(st.session_state['vehicles_data'], "vehicles_data")
             else:
                 st.warning("Aucune donnée récupérée n'est disponible. Veuillez d'abord récupérer les données.")
 
@@ -265,21 +234,25 @@ with col2:
             if not df_motorcycles.empty:
                 st.success(f"Scraping réussi de {len(df_motorcycles)} motos depuis {selected_pages} pages !")
                 st.dataframe(df_motorcycles, use_container_width=True)
-                st.markdown(create_download_link(df_motorcycles, "motorcycle_data.csv"), unsafe_allow_html=True)
+                render_downloads(df_motorcycles, "motorcycle_data")
                 st.session_state['motorcycle_data'] = df_motorcycles
             else:
                 st.warning("Aucune donnée de moto trouvée.")
 
         elif selected_option == "Scraper des données avec Web Scraper":
             st.subheader("Téléchargement des données Web Scraper (non nettoyées)")
-            
+            from scraper import WEBSCRAPER_FILES, file_version
+
             with st.spinner("Chargement des données Web Scraper..."):
-                time.sleep(2) 
                 try:
-                    df_raw_webscraper = pd.read_csv("C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\dakar-auto-scooter.csv")
+                    path = WEBSCRAPER_FILES['motorcycles']
+                    version = file_version(path)
+                    df_raw_webscraper = load_webscraper_data(path, version)
                     st.success(f"{len(df_raw_webscraper)} lignes chargées depuis Web Scraper.")
                     st.dataframe(df_raw_webscraper)
-                    st.markdown(create_download_link(df_raw_webscraper, "dakar-auto-scooter.csv"), unsafe_allow_html=True)
+                    render_downloads(df_raw_webscraper, "dakar-auto-scooter")
+                    with st.expander("Aperçu des données nettoyées"):
+                        st.dataframe(clean_webscraper_data(path, version), use_container_width=True)
                 except FileNotFoundError:
                     st.error("Fichier non trouvé. Assurez-vous d’avoir placé 'dakar-auto-scooter.csv' dans le dossier /data.")
 
@@ -288,7 +261,7 @@ with col2:
             if st.session_state['motorcycle_data'] is not None and not st.session_state['motorcycle_data'].empty:
                 st.subheader("Telechargement des données de moto")
                 st.dataframe(st.session_state['motorcycle_data'], use_container_width=True)
-                st.markdown(create_download_link(st.session_state['motorcycle_data'], "motorcycle_data.csv"), unsafe_allow_html=True)
+                render_downloads(st.session_state['motorcycle_data'], "motorcycle_data")
             else:
                 st.warning("No scraped data available. Please scrape data first.")
 
@@ -303,21 +276,25 @@ with col3:
             if not df_rentals.empty:
                 st.success(f"Scraping réussi de {len(df_rentals)} locations depuis {selected_pages} pages !")
                 st.dataframe(df_rentals, use_container_width=True)
-                st.markdown(create_download_link(df_rentals, "rentals_data.csv"), unsafe_allow_html=True)
+                render_downloads(df_rentals, "rentals_data")
                 st.session_state['rentals_data'] = df_rentals
             else:
                 st.warning("Aucune donnée de location trouvée.")
         
         elif selected_option == "Scraper des données avec Web Scraper":
             st.subheader("Téléchargement des données Web Scraper (non nettoyées)")
-            
+            from scraper import WEBSCRAPER_FILES, file_version
+
             with st.spinner("Chargement des données Web Scraper..."):
-                time.sleep(2) 
                 try:
-                    df_raw_webscraper = pd.read_csv("C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\dakar-auto-location.csv")
+                    path = WEBSCRAPER_FILES['rentals']
+                    version = file_version(path)
+                    df_raw_webscraper = load_webscraper_data(path, version)
                     st.success(f"{len(df_raw_webscraper)} lignes chargées depuis Web Scraper.")
                     st.dataframe(df_raw_webscraper)
-                    st.markdown(create_download_link(df_raw_webscraper, "dakar-auto-location.csv"), unsafe_allow_html=True)
+                    render_downloads(df_raw_webscraper, "dakar-auto-location")
+                    with st.expander("Aperçu des données nettoyées"):
+                        st.dataframe(clean_webscraper_data(path, version), use_container_width=True)
                 except FileNotFoundError:
                     st.error("Fichier non trouvé. Assurez-vous d’avoir placé 'dakar-auto-location.csv' dans le dossier /data.")
 
@@ -326,7 +303,7 @@ with col3:
             if st.session_state['rentals_data'] is not None and not st.session_state['rentals_data'].empty:
                 st.subheader("Telechargement des données de location")
                 st.dataframe(st.session_state['rentals_data'], use_container_width=True)
-                st.markdown(create_download_link(st.session_state['rentals_data'], "rentals_data.csv"), unsafe_allow_html=True)
+                render_downloads(st.session_state['rentals_data'], "rentals_data")
             else:
                 st.warning("Aucune donnée récupérée n'est disponible. Veuillez d'abord récupérer les données.")
 
@@ -376,59 +353,106 @@ if selected_option == "Remplir le formulaire":
             st.write(f"- Performance : {performance}")
             if feedback:
                 st.write(f"- Commentaires : {feedback}")
+elif selected_option == "Tâches de scraping en arrière-plan":
+    st.subheader("Tâches de scraping en arrière-plan")
+    st.write("Les tâches tournent dans un processus séparé : elles continuent même si l'onglet est fermé.")
+    from scraper import list_jobs, submit_job
+
+    category_labels = {"Véhicules": VEHICLES.name, "Motos": MOTORCYCLES.name, "Locations": RENTALS.name}
+    with st.form("job_form"):
+        job_category = st.selectbox("Catégorie", list(category_labels))
+        first_page, last_page = st.slider("Pages", 1, 100, (1, 10))
+        if st.form_submit_button("Lancer la tâche"):
+            job = submit_job(category_labels[job_category], first_page, last_page, **scrape_options())
+            st.success(f"Tâche {job['id']} lancée.")
+
+    category_names = {name: label for label, name in category_labels.items()}
+    job_status_labels = {'pending': "En attente", 'running': "En cours", 'done': "Terminée", 'failed': "Échec"}
+
+    @st.fragment(run_every="2s")
+    def render_jobs():
+        jobs = list_jobs()
+        if not jobs:
+            st.info("Aucune tâche pour le moment.")
+            return
+        for job in jobs:
+            title = (f"{job['id']} · {category_names[job['category']]} · pages {job['first_page']}-{job['last_page']} · "
+                     f"{job_status_labels[job['status']]}")
+            with st.expander(title, expanded=job['status'] == 'running'):
+                st.progress(job['pages_done'] / job['pages_total'])
+                st.write(f"{job['pages_done']}/{job['pages_total']} pages, {job['rows']} annonces")
+                if job.get('details_total'):
+                    st.write(f"{job['details_done']}/{job['details_total']} pages de détail")
+                if job['error']:
+                    st.error(job['error'])
+                if job['messages']:
+                    st.text("\n".join(job['messages'][-10:]))
+                if job.get('metrics'):
+                    render_metrics(job['metrics'])
+                if job['status'] == 'done':
+                    df_job = load_job_result(job)
+                    st.dataframe(df_job, use_container_width=True)
+                    render_downloads(df_job, f"{job['category']}_{job['id']}")
+
+    render_jobs()
+
 elif selected_option == "Tableau de bord des données":
     st.subheader("Tableau de bord des données")
+    from scraper import DASHBOARD_FILES, DATASET_CATEGORIES, file_version
 
     dataset_choice = st.radio("Choisissez le dataset à afficher :", 
                               ("Véhicules", "Motos", "Locations"))
+    data_source = st.radio("Source des données :", ("Fichiers CSV", "Base locale (annonces scrappées)"),
+                           horizontal=True)
+
+    if data_source == "Fichiers CSV":
+        selected_file = DASHBOARD_FILES[dataset_choice]
+
+        try:
+            version = file_version(selected_file)
+            df_dashboard = load_dashboard_dataset(selected_file, version)
+            st.success(f"{len(df_dashboard)} lignes chargées pour {dataset_choice}")
+            st.dataframe(df_dashboard, use_container_width=True)
+
+            for title, values in load_dashboard_charts(dataset_choice, selected_file, version):
+                st.write(f"### {title}")
+                st.bar_chart(values)
 
-    file_map = {
-        "Véhicules": "C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\vehicles.csv",
-        "Motos": "C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\motorcycles.csv",
-        "Locations": "C:\\Users\\skabo\\OneDrive\\Bureau\\DIT - Maitrise en Intelligence Artificielle\\Data Collection\\Examen\\data\\locations.csv"
-    }
-
-    selected_file = file_map[dataset_choice]
-
-    try:
-        df_dashboard = pd.read_csv(selected_file)
-        st.success(f"{len(df_dashboard)} lignes chargées pour {dataset_choice}")
-        st.dataframe(df_dashboard, use_container_width=True)
-
-        if dataset_choice == "Véhicules":
-            st.write("### Top Marques")
-            marque_counts = df_dashboard['marque'].value_counts().head(10)
-            st.bar_chart(marque_counts)
-
-            st.write("### Prix moyen par marque (Top 5)")
-            df_dashboard['prix'] = pd.to_numeric(df_dashboard['prix'], errors='coerce')
-            prix_moyens = df_dashboard.groupby('marque')['prix'].mean().sort_values(ascending=False).head(5)
-            st.bar_chart(prix_moyens)
-
-        elif dataset_choice == "Motos":
-            st.write("### Kilométrage moyen par marque (Top 5)")
-            df_dashboard['kilométrage'] = pd.to_numeric(df_dashboard['kilométrage'], errors='coerce')
-            km_moyens = df_dashboard.groupby('marque')['kilométrage'].mean().sort_values(ascending=False).head(5)
-            st.bar_chart(km_moyens)
-
-            st.write("### Distribution des années")
-            annee_counts = df_dashboard['année'].value_counts().sort_index()
-            st.bar_chart(annee_counts)
-
-        elif dataset_choice == "Locations":
-            st.write("### Répartition par propriétaires")
-            proprios = df_dashboard['propriétaire'].value_counts().head(10)
-            st.bar_chart(proprios)
-
-            st.write("### Prix moyen par marque")
-            df_dashboard['prix'] = pd.to_numeric(df_dashboard['prix'], errors='coerce')
-            prix_loc = df_dashboard.groupby('marque')['prix'].mean().sort_values(ascending=False).head(5)
-            st.bar_chart(prix_loc)
-
-    except FileNotFoundError:
-        st.warning(f"Fichier introuvable : {selected_file}")
-    except Exception as e:
-        st.error(f"Erreur lors du chargement ou de l'affichage : {e}")
+        except FileNotFoundError:
+            st.warning(f"Fichier introuvable : {selected_file}")
+        except Exception as e:
+            st.error(f"Erreur lors du chargement ou de l'affichage : {e}")
+
+    else:
+        category = DATASET_CATEGORIES[dataset_choice]
+        store = listing_store()
+        version = store.version(category)
+
+        if not version[0]:
+            st.warning("Aucune annonce en base pour cette catégorie. Lancez d'abord un scraping.")
+        else:
+            # Filtres appliqués par la base (index sur marque, année et prix) ; une plage
+            # laissée à ses bornes n'est pas filtrée, pour garder les valeurs manquantes
+            marques = st.multiselect("Marques", store.marques(category))
+            ranges = {}
+            for column, label in (('annee', "Années"), ('prix', "Prix (F CFA)")):
+                bounds = store.bounds(category, column)
+                if bounds and bounds[0] < bounds[1]:
+                    selected = st.slider(label, *bounds, bounds)
+                    ranges[column] = selected if selected != bounds else None
+            filters = (tuple(marques), ranges.get('annee'), ranges.get('prix'))
+
+            try:
+                df_dashboard = query_store_listings(category, version, filters)
+                st.success(f"{len(df_dashboard)} annonces trouvées pour {dataset_choice}")
+                st.dataframe(df_dashboard, use_container_width=True)
+
+                for title, values in query_store_charts(dataset_choice, version, filters):
+                    st.write(f"### {title}")
+                    st.bar_chart(values)
+
+            except Exception as e:
+                st.error(f"Erreur lors de l'interrogation de la base : {e}")
 
 
 # Footer
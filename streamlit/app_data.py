@@ -0,0 +1,76 @@
+"""Données et ressources de l'application Streamlit, mises en cache entre les reruns.
+
+Défini hors de app.py pour n'être chargé qu'une fois par processus ; les modules
+lourds (pandas, requests, bs4) ne sont importés qu'au premier appel qui en a besoin.
+"""
+import streamlit as st
+
+# Nombre maximal d'annonces affichées depuis la base locale
+STORE_ROW_LIMIT = 5000
+
+
+# Ressources partagées entre sessions : base locale et processus de parsing
+@st.cache_resource(show_spinner=False)
+def listing_store():
+    from scraper import get_store
+    return get_store()
+
+
+# Un pool par nombre de processus (voir get_parse_pool) : démarré une fois, jamais évincé
+@st.cache_resource(show_spinner="Démarrage des processus de parsing...")
+def parse_pool(workers):
+    from scraper import warm_parse_pool
+    return warm_parse_pool(workers)
+
+
+# Export mis en cache par empreinte du contenu : sérialisé une fois par version du dataset
+@st.cache_data(show_spinner=False, max_entries=32)
+def export_dataset(_df, digest, fmt):
+    from scraper import export_bytes
+    return export_bytes(_df, fmt)
+
+
+# Chargement des datasets mis en cache, invalidé par la date de modification du fichier
+@st.cache_data(show_spinner=False)
+def load_dashboard_dataset(path, version):
+    from scraper import load_dataset
+    return load_dataset(path)
+
+
+@st.cache_data(show_spinner=False)
+def load_dashboard_charts(dataset, path, version):
+    from scraper import compute_charts
+    return compute_charts(load_dashboard_dataset(path, version), dataset)
+
+
+@st.cache_data(show_spinner=False)
+def load_webscraper_data(path, version):
+    import pandas as pd
+    return pd.read_csv(path)
+
+
+@st.cache_data(show_spinner=False)
+def clean_webscraper_data(path, version):
+    from scraper import clean_listings
+    return clean_listings(load_webscraper_data(path, version))
+
+
+# Requêtes sur la base locale, mises en cache tant que la catégorie n'a pas changé
+@st.cache_data(show_spinner=False, max_entries=64)
+def query_store_listings(category, version, filters):
+    marques, years, prices = filters
+    return listing_store().query(category, limit=STORE_ROW_LIMIT, marques=list(marques), years=years, prices=prices)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def query_store_charts(dataset, version, filters):
+    from scraper import compute_store_charts
+    marques, years, prices = filters
+    return compute_store_charts(listing_store(), dataset, marques=list(marques), years=years, prices=prices)
+
+
+# Le résultat d'une tâche terminée ne change plus : mis en cache par identifiant
+@st.cache_data(show_spinner=False, max_entries=16, hash_funcs={dict: lambda job: job['id']})
+def load_job_result(job):
+    from scraper import load_result
+    return load_result(job)
@@ -0,0 +1,60 @@
+"""Mesure du temps et de la mémoire de parsing des pages d'annonces.
+
+Usage (depuis le dossier streamlit/) : python -m benchmarks.parse [--repeat N]
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from scraper.parse import LISTING_CARD, VEHICLE_CARD, parse_cards
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+PAGES = {
+    'vehicles': ('vehicles.html', VEHICLE_CARD),
+    'motorcycles': ('motorcycles.html', LISTING_CARD),
+    'rentals': ('rentals.html', LISTING_CARD),
+}
+
+
+def available_parsers():
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        pass
+    return parsers
+
+
+def measure(markup, card, parser, restrict, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cards = parse_cards(markup, card, parser=parser, restrict=restrict, encoding='utf-8')
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse_cards(markup, card, parser=parser, restrict=restrict, encoding='utf-8')
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(cards)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<12} {'parser':<12} {'mode':<10} {'cartes':>6} {'ms/page':>9} {'pic Ko':>8}")
+    for name, (filename, card) in PAGES.items():
+        markup = (FIXTURES / filename).read_bytes()
+        for backend in available_parsers():
+            for restrict in (False, True):
+                elapsed, peak, count = measure(markup, card, backend, restrict, args.repeat)
+                mode = 'strainer' if restrict else 'complet'
+                print(f"{name:<12} {backend:<12} {mode:<10} {count:>6} {elapsed * 1000:>9.2f} {peak / 1024:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Benchmark hors ligne du scraping des trois catégories contre le serveur local.
+
+Usage (depuis le dossier streamlit/) :
+    python -m benchmarks.scrape --pages 20 [--latency 50 --error-rate 0.02 --throttle-rate 0.02]
+    python -m benchmarks.scrape --json resultats.json
+    python -m benchmarks.scrape --baseline resultats.json [--tolerance 0.2]
+
+Chaque catégorie est scrapée dans un processus neuf (pic mémoire propre à la
+catégorie), sans cache HTTP ni écriture dans la base locale ou l'index des
+annonces vues ; --details ajoute la récupération des pages d'annonces. Avec
+--baseline, le code de sortie vaut 1 si le débit baisse de plus de --tolerance
+par rapport aux résultats de référence.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.server import FIXTURES, add_site_arguments, serve, site_from_arguments
+from scraper.detail import DEFAULT_DETAIL_CONCURRENCY
+from scraper.fetch import DEFAULT_CONCURRENCY
+from scraper.metrics import Metrics
+from scraper.pipeline import DEFAULT_WORKERS, parse_page, shutdown_parse_pools, warm_parse_pool
+from scraper.runner import scrape
+from scraper.schema import CATEGORIES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FIXTURE_FILES = {
+    'vehicles': 'vehicles.html',
+    'motorcycles': 'motorcycles.html',
+    'rentals': 'rentals.html',
+}
+
+# Métriques comparées à la référence : plus grand = meilleur
+THROUGHPUT_METRICS = ('pages_per_sec', 'listings_per_sec')
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus et de ses enfants (pool de parsing), en Mo."""
+    if resource is None:
+        return None
+    rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en octets sous macOS, en Ko ailleurs
+    return rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def parse_time_per_card(category, repeat=20):
+    """Temps moyen de parsing + extraction d'une carte, mesuré sur la fixture (ms)."""
+    body = (FIXTURES / FIXTURE_FILES[category]).read_bytes()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows, _, _ = parse_page(category, body, 'utf-8')
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed * 1000 / max(1, len(rows))
+
+
+def run_category(category, base_url, pages, options):
+    """Scrape `pages` pages d'une catégorie ; exécuté dans un processus dédié."""
+    schema = CATEGORIES[category]
+    latencies = []
+    # Démarrage des processus de parsing hors du temps mesuré
+    warm_parse_pool(options.get('workers', DEFAULT_WORKERS))
+
+    def on_page(page, done, total, buffer):
+        latencies.append(page.fetch.elapsed)
+
+    metrics = Metrics()
+    start = time.perf_counter()
+    try:
+        df = scrape(schema, 1, pages, on_page=on_page, persist=False, metrics=metrics,
+                    use_cache=False, base_url=base_url, **options)
+        elapsed = time.perf_counter() - start
+    finally:
+        # Les pools de parsing partagés doivent être arrêtés pour que ce processus puisse se terminer
+        shutdown_parse_pools()
+
+    counters = metrics.snapshot()['counters']
+    return {
+        'category': category,
+        'pages': pages,
+        'failed_pages': counters['pages_failed'],
+        'detail_pages': counters['details_ok'],
+        'listings': len(df),
+        'seconds': elapsed,
+        'pages_per_sec': pages / elapsed,
+        'listings_per_sec': len(df) / elapsed,
+        'latency_p50_ms': percentile(latencies, 50) * 1000,
+        'latency_p95_ms': percentile(latencies, 95) * 1000,
+        'parse_ms_per_card': parse_time_per_card(category),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_isolated(category, base_url, pages, options):
+    """Exécute run_category dans un processus neuf ; renvoie ses résultats ou l'erreur rencontrée."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(run_category, category, base_url, pages, options).result()
+        except Exception as e:
+            return {'category': category, 'error': repr(e)}
+
+
+def regressions(results, baseline, tolerance):
+    """Messages décrivant les baisses de débit de plus de `tolerance` par rapport à `baseline`."""
+    reference = {r['category']: r for r in baseline.get('results', [])}
+    messages = []
+    for result in results:
+        previous = reference.get(result['category'])
+        if previous is None or 'error' in result:
+            continue
+        for metric in THROUGHPUT_METRICS:
+            if previous.get(metric) and result[metric] < previous[metric] * (1 - tolerance):
+                messages.append(f"{result['category']}: {metric} {result[metric]:.1f} "
+                                f"< {previous[metric]:.1f} (référence) - {tolerance:.0%}")
+    return messages
+
+
+def print_results(results):
+    print(f"{'catégorie':<12} {'pages/s':>8} {'annonces/s':>11} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'ms/carte':>9} {'pic Mo':>7} {'échecs':>7} {'détails':>8}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['category']:<12} erreur : {r['error']}")
+            continue
+        rss = f"{r['peak_rss_mb']:>7.0f}" if r['peak_rss_mb'] is not None else f"{'-':>7}"
+        print(f"{r['category']:<12} {r['pages_per_sec']:>8.1f} {r['listings_per_sec']:>11.1f} "
+              f"{r['latency_p50_ms']:>8.1f} {r['latency_p95_ms']:>8.1f} {r['parse_ms_per_card']:>9.3f} "
+              f"{rss} {r['failed_pages']:>7} {r['detail_pages']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--category', choices=sorted(CATEGORIES), action='append',
+                        help="catégorie à mesurer (répétable ; toutes par défaut)")
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=0,
+                        help="requêtes/seconde par hôte, pages de liste et de détail (0 = sans limite)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--details', action='store_true', help="récupère aussi les pages de détail")
+    parser.add_argument('--detail-concurrency', type=int, default=DEFAULT_DETAIL_CONCURRENCY)
+    add_site_arguments(parser)
+    parser.add_argument('--json', type=Path, help="écrit les résultats dans ce fichier JSON")
+    parser.add_argument('--baseline', type=Path, help="fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="baisse de débit tolérée (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    server, base_url = serve(site_from_arguments(args))
+    options = dict(concurrency=args.concurrency, rate=args.rate, workers=args.workers, details=args.details,
+                   detail_concurrency=args.detail_concurrency, detail_rate=args.rate)
+    try:
+        results = [run_isolated(category, base_url, args.pages, options)
+                   for category in args.category or FIXTURE_FILES]
+    finally:
+        server.shutdown()
+
+    print_results(results)
+    report = {
+        'settings': {k: v for k, v in vars(args).items() if k not in ('json', 'baseline')},
+        'server': {str(status): count for status, count in sorted(server.site.stats.items())},
+        'results': results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+
+    if any('error' in r for r in results):
+        return 1
+    if args.baseline:
+        messages = regressions(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+        for message in messages:
+            print("Régression :", message)
+        return 1 if messages else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Serveur HTTP local imitant les pages d'annonces de dakar-auto.com, pour les benchmarks.
+
+Usage (depuis le dossier streamlit/) :
+    python -m benchmarks.server --port 8765 --latency 80 --error-rate 0.02 --throttle-rate 0.05
+
+Les pages sont servies à partir des fixtures ; les identifiants d'annonces sont
+décalés selon le numéro de page et toute URL d'annonce (.../annonce-ID) renvoie la
+page de détail de la fixture. Latences et pannes sont tirées d'un générateur
+initialisé par (graine, URL, numéro de tentative) : une même exécution se rejoue
+à l'identique, quel que soit l'ordre des requêtes concurrentes.
+"""
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+# Préfixe de chemin de chaque catégorie -> fixture
+ROUTES = {
+    '/senegal/voitures-4': 'vehicles.html',
+    '/senegal/motos-and-scooters-3': 'motorcycles.html',
+    '/senegal/location-de-voitures-19': 'rentals.html',
+}
+
+DETAIL_FIXTURE = 'detail.html'
+
+_ANNONCE = re.compile(rb'annonce-(\d+)')
+_DETAIL_PATH = re.compile(r'/annonce-(\d+)$')
+
+
+@lru_cache(maxsize=256)
+def render_page(fixture, page):
+    """Page `page` d'une fixture : mêmes cartes, identifiants d'annonces propres à la page."""
+    body = (FIXTURES / fixture).read_bytes()
+    if page <= 1:
+        return body
+    return _ANNONCE.sub(lambda m: b'annonce-%d' % (int(m.group(1)) + page * 100000), body)
+
+
+@lru_cache(maxsize=1024)
+def render_detail(annonce):
+    """Page de détail de l'annonce `annonce` (même contenu, identifiant de l'annonce)."""
+    return _ANNONCE.sub(b'annonce-' + annonce.encode(), (FIXTURES / DETAIL_FIXTURE).read_bytes())
+
+
+class MockSite:
+    """Paramètres de simulation : latence (ms), jitter (ms), taux d'erreurs 500 et de 429."""
+
+    def __init__(self, latency=50.0, jitter=20.0, error_rate=0.0, throttle_rate=0.0, retry_after=1, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.stats = Counter()
+        self._attempts = Counter()
+        self._lock = threading.Lock()
+
+    def plan(self, url):
+        """(délai en secondes, statut) de la prochaine réponse pour `url`."""
+        with self._lock:
+            attempt = self._attempts[url]
+            self._attempts[url] += 1
+        rng = random.Random(f'{self.seed}:{url}:{attempt}')
+        delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter)) / 1000
+        roll = rng.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 500
+        return delay, 200
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            fixture = ROUTES.get(parts.path)
+            detail = _DETAIL_PATH.search(parts.path)
+            if fixture is None and detail is None:
+                self._send(404, b'not found')
+                return
+            delay, status = site.plan(self.path)
+            time.sleep(delay)
+            with site._lock:
+                site.stats[status] += 1
+            if status != 200:
+                headers = {'Retry-After': str(site.retry_after)} if status == 429 else {}
+                self._send(status, b'error', headers)
+                return
+            if detail is not None:
+                body = render_detail(detail.group(1))
+            else:
+                body = render_page(fixture, int(parse_qs(parts.query).get('page', ['1'])[0]))
+            self._send(200, body, {'Content-Type': 'text/html; charset=utf-8'})
+
+        def _send(self, status, body, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(site, host='127.0.0.1', port=0):
+    """Démarre le serveur dans un thread ; renvoie (serveur, URL de base)."""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    server.site = site
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_port}'
+
+
+def add_site_arguments(parser):
+    parser.add_argument('--latency', type=float, default=50.0, help="latence moyenne en ms")
+    parser.add_argument('--jitter', type=float, default=20.0, help="variation de latence en ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="proportion de réponses 500")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="proportion de réponses 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="valeur de Retry-After des 429 (s)")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def site_from_arguments(args):
+    return MockSite(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(site_from_arguments(args)))
+    server.daemon_threads = True
+    print(f'http://{args.host}:{server.server_port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
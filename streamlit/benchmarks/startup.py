@@ -0,0 +1,129 @@
+"""Benchmark du démarrage de l'application et du coût d'un rerun, par page de la barre latérale.
+
+Usage (depuis le dossier streamlit/) :
+    python -m benchmarks.startup [--reruns 10]
+    python -m benchmarks.startup --budget-cold-ms 1500 --budget-rerun-ms 150 [--json resultats.json]
+
+Chaque page est mesurée dans un processus neuf avec le testeur d'applications de
+Streamlit : premier affichage (import de l'application compris, hors import de
+streamlit), puis --reruns reruns sans interaction. Les modules lourds chargés après
+le premier affichage sont listés. Le code de sortie vaut 1 si un budget est dépassé.
+"""
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Pas d'import de scraper ici : ce module est chargé par les processus de mesure
+APP = Path(__file__).resolve().parent.parent / 'app.py'
+
+# Pages de la barre latérale (libellés de app.py) ; la première est affichée par défaut
+PAGES = [
+    "Scraper des données avec beautifulSoup",
+    "Scraper des données avec Web Scraper",
+    "Tableau de bord des données",
+    "Tâches de scraping en arrière-plan",
+    "Remplir le formulaire",
+]
+
+# Modules dont le chargement au démarrage est surveillé
+HEAVY_MODULES = ('pandas', 'requests', 'bs4', 'lxml', 'sqlite3')
+
+
+def run_page(page, reruns):
+    """Affiche `page` dans un testeur neuf ; renvoie les durées en millisecondes."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_ms = (time.perf_counter() - start) * 1000
+
+    at = AppTest.from_file(str(APP), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    if page != PAGES[0]:
+        # Le premier affichage passe toujours par la page par défaut
+        next(s for s in at.sidebar.selectbox if page in s.options).select(page).run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    durations = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        durations.append((time.perf_counter() - start) * 1000)
+    errors = [e.value for e in at.exception]
+    return {
+        'page': page,
+        'streamlit_import_ms': import_ms,
+        'cold_ms': cold_ms,
+        'rerun_p50_ms': statistics.median(durations) if durations else 0.0,
+        'rerun_max_ms': max(durations, default=0.0),
+        'heavy_modules': loaded,
+        'errors': errors,
+    }
+
+
+def run_isolated(page, reruns):
+    """Exécute run_page dans un processus neuf ; renvoie ses résultats ou l'erreur rencontrée."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(run_page, page, reruns).result()
+        except Exception as e:
+            return {'page': page, 'error': repr(e)}
+
+
+def over_budget(results, cold_ms, rerun_ms):
+    """Messages décrivant les dépassements de budget (None = pas de budget)."""
+    messages = []
+    for result in results:
+        if 'error' in result:
+            continue
+        if cold_ms is not None and result['cold_ms'] > cold_ms:
+            messages.append(f"{result['page']}: démarrage {result['cold_ms']:.0f} ms > {cold_ms:.0f} ms")
+        if rerun_ms is not None and result['rerun_p50_ms'] > rerun_ms:
+            messages.append(f"{result['page']}: rerun {result['rerun_p50_ms']:.0f} ms > {rerun_ms:.0f} ms")
+    return messages
+
+
+def print_results(results):
+    print(f"{'page':<40} {'démarrage ms':>13} {'rerun p50':>10} {'rerun max':>10}  modules lourds")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['page']:<40} erreur : {r['error']}")
+            continue
+        print(f"{r['page']:<40} {r['cold_ms']:>13.0f} {r['rerun_p50_ms']:>10.1f} {r['rerun_max_ms']:>10.1f}  "
+              f"{', '.join(r['heavy_modules']) or '-'}")
+        for error in r['errors']:
+            print(f"{'':<40} exception : {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page', choices=PAGES, action='append',
+                        help="page à mesurer (répétable ; toutes par défaut)")
+    parser.add_argument('--reruns', type=int, default=10)
+    parser.add_argument('--budget-cold-ms', type=float, help="durée maximale du premier affichage")
+    parser.add_argument('--budget-rerun-ms', type=float, help="durée médiane maximale d'un rerun")
+    parser.add_argument('--json', type=Path, help="écrit les résultats dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    results = [run_isolated(page, args.reruns) for page in args.page or PAGES]
+    print_results(results)
+    if args.json:
+        report = {'settings': {k: v for k, v in vars(args).items() if k != 'json'}, 'results': results}
+        args.json.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+
+    if any('error' in r or r['errors'] for r in results):
+        return 1
+    messages = over_budget(results, args.budget_cold_ms, args.budget_rerun_ms)
+    for message in messages:
+        print("Budget dépassé :", message)
+    return 1 if messages else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
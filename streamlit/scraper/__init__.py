@@ -0,0 +1,46 @@
+"""Scraping des annonces de dakar-auto.com.
+
+Les noms publics sont chargés à la demande : `from scraper import VEHICLES` n'importe
+que le module concerné, sans pandas, requests ni bs4 tant qu'ils ne servent pas.
+"""
+import importlib
+
+# Noms publics, par module
+_EXPORTS = {
+    'cache': ('ResponseCache',),
+    'clean': ('clean_listings', 'to_integer', 'to_year'),
+    'datasets': ('DASHBOARD_FILES', 'DATASET_CATEGORIES', 'WEBSCRAPER_FILES', 'compute_charts', 'compute_store_charts',
+                 'file_version', 'load_dataset'),
+    'detail': ('DEFAULT_DETAIL_CONCURRENCY', 'DEFAULT_DETAIL_RATE', 'LISTINGS_PER_PAGE', 'MAX_DETAIL_CONCURRENCY',
+               'DetailCrawler', 'DetailResult', 'enrich_listings', 'get_detail_client', 'parse_detail'),
+    'export': ('EXPORT_FORMATS', 'dataset_hash', 'export_bytes'),
+    'fetch': ('DEFAULT_CONCURRENCY', 'DEFAULT_RATE', 'FetchResult', 'HostLimiter', 'TokenBucket', 'fetch_pages'),
+    'frame': ('ColumnBuffer',),
+    'jobs': ('list_jobs', 'load_job', 'load_result', 'submit_job'),
+    'metrics': ('COUNTERS', 'STAGES', 'Histogram', 'Metrics'),
+    'parse': ('DEFAULT_PARSER', 'LISTING_CARD', 'VEHICLE_CARD', 'make_soup', 'parse_cards'),
+    'pipeline': ('DEFAULT_WORKERS', 'PageResult', 'crawl_incremental', 'get_parse_pool', 'new_rows', 'parse_page',
+                 'scrape_pages', 'shutdown_parse_pools', 'submit_parse', 'warm_parse_pool'),
+    'runner': ('iter_scrape', 'page_messages', 'scrape', 'write_output'),
+    'schema': ('BASE_URL', 'CATEGORIES', 'ID_COLUMN', 'MOTORCYCLES', 'RENTALS', 'URL_COLUMN', 'VEHICLES', 'Field',
+               'Schema'),
+    'seen': ('SeenIndex', 'get_seen_index'),
+    'session': ('HttpClient', 'get_cache', 'get_client'),
+    'store': ('ListingStore', 'get_store'),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,111 @@
+"""Scraping de dakar-auto.com en ligne de commande, sans Streamlit.
+
+Exemples (depuis le dossier streamlit/) :
+    python -m scraper --category vehicles --pages 1-50 --out vehicles.parquet
+    python -m scraper --category motorcycles --pages 1-5 --out motos.csv --incremental
+    python -m scraper --category motorcycles --pages 1-5 --out motos.parquet --details
+    python -m scraper --category rentals --pages 1-20 --background
+    python -m scraper --category vehicles --pages 1-10 --out vehicles.csv --metrics metrics.prom
+"""
+import argparse
+import sys
+
+from .detail import DEFAULT_DETAIL_CONCURRENCY, DEFAULT_DETAIL_RATE
+from .fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE
+from .jobs import JOBS_DIR, run_job, submit_job
+from .metrics import Metrics
+from .pipeline import DEFAULT_WORKERS
+from .runner import format_for_path, page_messages, scrape, write_output
+from .schema import CATEGORIES
+
+
+def parse_pages(value):
+    """'5' -> (1, 5), '3-10' -> (3, 10)."""
+    try:
+        first, _, last = value.partition('-')
+        first, last = (1, int(first)) if not last else (int(first), int(last))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"plage de pages invalide : {value!r} (ex. 1-50)")
+    if first < 1 or last < first:
+        raise argparse.ArgumentTypeError(f"plage de pages invalide : {value!r} (ex. 1-50)")
+    return first, last
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m scraper', description=__doc__.splitlines()[0],
+                                     epilog='\n'.join(__doc__.splitlines()[2:]),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--category', choices=sorted(CATEGORIES))
+    parser.add_argument('--pages', type=parse_pages, default=(1, 1), help="plage de pages, ex. 1-50 (défaut : 1)")
+    parser.add_argument('--out', help="fichier de sortie (.csv, .csv.gz ou .parquet)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="requêtes simultanées")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="requêtes par seconde")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="processus de parsing (0 = sur place)")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help="désactive le cache HTTP")
+    parser.add_argument('--incremental', action='store_true', help="nouvelles annonces seulement")
+    parser.add_argument('--details', action='store_true',
+                        help="récupère aussi la page de chaque annonce (caractéristiques complètes)")
+    parser.add_argument('--detail-concurrency', type=int, default=DEFAULT_DETAIL_CONCURRENCY,
+                        help="requêtes simultanées pour les pages de détail")
+    parser.add_argument('--detail-rate', type=float, default=DEFAULT_DETAIL_RATE,
+                        help="requêtes par seconde pour les pages de détail")
+    parser.add_argument('--no-store', dest='persist', action='store_false',
+                        help="n'enregistre pas les annonces dans la base locale ni dans l'index des annonces vues")
+    parser.add_argument('--background', action='store_true', help="lance une tâche en arrière-plan et rend la main")
+    parser.add_argument('--metrics', help="écrit les métriques du scraping (.json, sinon format Prometheus)")
+    parser.add_argument('--quiet', action='store_true', help="n'affiche pas la progression")
+    parser.add_argument('--job', help=argparse.SUPPRESS)
+    parser.add_argument('--jobs-dir', default=str(JOBS_DIR), help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Point d'entrée du processus worker lancé par submit_job
+    if args.job:
+        job = run_job(args.job, args.jobs_dir)
+        return 0 if job['status'] == 'done' else 1
+
+    if not args.category:
+        parser.error("--category est obligatoire")
+    options = dict(concurrency=args.concurrency, rate=args.rate, use_cache=args.use_cache,
+                   workers=args.workers, incremental=args.incremental, persist=args.persist,
+                   details=args.details, detail_concurrency=args.detail_concurrency, detail_rate=args.detail_rate)
+    first, last = args.pages
+
+    if args.background:
+        job = submit_job(args.category, first, last, root=args.jobs_dir, **options)
+        print(job['id'])
+        return 0
+
+    if not args.out:
+        parser.error("--out est obligatoire (ou --background)")
+    try:
+        format_for_path(args.out)
+    except ValueError as e:
+        parser.error(str(e))
+
+    schema = CATEGORIES[args.category]
+
+    def on_page(page, done, total, buffer):
+        if args.quiet:
+            return
+        for level, text in page_messages(schema, page):
+            print(f"[{done}/{total}] {level}: {text}", file=sys.stderr)
+
+    metrics = Metrics()
+    df = scrape(schema, first, last, on_page=on_page, metrics=metrics, **options)
+    write_output(df, args.out)
+    print(f"{len(df)} annonces écrites dans {args.out}", file=sys.stderr)
+    empty = metrics.counters['details_empty']
+    if empty:
+        print(f"attention : {empty} page(s) de détail sans caractéristiques reconnues", file=sys.stderr)
+    if args.metrics:
+        metrics.write(args.metrics)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
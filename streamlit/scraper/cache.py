@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Emplacement par défaut du cache, à la racine du dépôt
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / '.cache' / 'http_cache.sqlite'
+DEFAULT_TTL = 300
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    encoding TEXT,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+class CacheEntry:
+    def __init__(self, url, body, encoding, content_type, etag, last_modified, fetched_at):
+        self.url = url
+        self.body = body
+        self.encoding = encoding
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self):
+        """En-têtes de requête conditionnelle pour revalider l'entrée."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self):
+        # requests n'est importé qu'ici : les modules qui n'ont besoin que de
+        # DEFAULT_CACHE_PATH (base locale, tâches, datasets) ne le chargent pas
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.body
+        response.encoding = self.encoding
+        response.headers = CaseInsensitiveDict()
+        if self.content_type:
+            response.headers['Content-Type'] = self.content_type
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """Cache disque des réponses HTTP (SQLite), avec TTL et éviction LRU par taille."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, body, encoding, content_type, etag, last_modified, fetched_at '
+                'FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(*row)
+
+    def put(self, url, response):
+        body = response.content
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, body, len(body), response.encoding, response.headers.get('Content-Type'),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now))
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url):
+        """Marque une entrée comme revalidée (réponse 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Supprime les entrées les moins récemment utilisées jusqu'à repasser sous la limite
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
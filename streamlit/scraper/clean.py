@@ -0,0 +1,65 @@
+import pandas as pd
+
+from .schema import ID_COLUMN, MISSING, URL_COLUMN
+
+# Noms de colonnes rencontrés (scrapers, exports Web Scraper, CSV du tableau de bord)
+COLUMN_ALIASES = {
+    'annee': 'année',
+    'kilometrage': 'kilométrage',
+    'proprietaire': 'propriétaire',
+    'article-links-href': URL_COLUMN,
+}
+
+INTEGER_COLUMNS = ['prix', 'kilométrage']
+CATEGORY_COLUMNS = ['marque', 'boite vitesse', 'carburant']
+TEXT_COLUMNS = ['adresse', 'propriétaire']
+
+
+def _text(series):
+    """Texte nettoyé : espaces normalisés, valeurs manquantes ('---', vide) en NA."""
+    text = series.astype('string').str.replace(r'\s+', ' ', regex=True).str.strip()
+    return text.mask(text.isin(['', MISSING]))
+
+
+def to_integer(series):
+    """'2 500 000 F CFA' -> 2500000, '17 000 km' -> 17000 (Int64, NA si pas de chiffre)."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.round().astype('Int64')
+    digits = series.astype('string').str.replace(r'\D', '', regex=True)
+    return pd.to_numeric(digits.mask(digits == ''), errors='coerce').astype('Int64')
+
+
+def to_year(series):
+    """'Année: 2021', ' 2011' ou 2011 -> 2011 (Int64) ; tout le reste -> NA."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.round().astype('Int64')
+    years = series.astype('string').str.extract(r'\b((?:19|20)\d{2})\b', expand=False)
+    return pd.to_numeric(years, errors='coerce').astype('Int64')
+
+
+def clean_listings(df):
+    """Renvoie une copie typée d'un DataFrame d'annonces, sans boucle Python par ligne.
+
+    Colonnes numériques en Int64 (prix, kilométrage, année), colonnes répétitives en
+    category (marque, boite vitesse, carburant) ; les noms de colonnes sont unifiés.
+    """
+    df = df.rename(columns=lambda c: COLUMN_ALIASES.get(c.strip(), c.strip()))
+    df = df.loc[:, ~df.columns.duplicated()].copy()
+
+    for column in INTEGER_COLUMNS:
+        if column in df:
+            df[column] = to_integer(df[column])
+    if 'année' in df:
+        df['année'] = to_year(df['année'])
+    if 'marque' in df:
+        # Les exports Web Scraper contiennent le titre complet : on garde le premier mot
+        df['marque'] = _text(df['marque']).str.extract(r'^(\S+)', expand=False)
+    for column in CATEGORY_COLUMNS:
+        if column in df:
+            df[column] = _text(df[column]).astype('category')
+    for column in TEXT_COLUMNS:
+        if column in df:
+            df[column] = _text(df[column])
+    if URL_COLUMN in df and ID_COLUMN not in df:
+        df[ID_COLUMN] = df[URL_COLUMN].astype('string').str.extract(r'annonce-(\d+)', expand=False)
+    return df
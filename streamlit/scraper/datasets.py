@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_PATH
+from .clean import clean_listings
+
+# Chemins relatifs au dépôt
+DATA_DIR = Path(__file__).resolve().parents[2] / 'data'
+COLUMNAR_DIR = DEFAULT_CACHE_PATH.parent / 'datasets'
+
+# Datasets du tableau de bord (nettoyés) et exports Web Scraper (bruts)
+DASHBOARD_FILES = {
+    "Véhicules": DATA_DIR / 'vehicles.csv',
+    "Motos": DATA_DIR / 'motorcycles.csv',
+    "Locations": DATA_DIR / 'locations.csv',
+}
+DATASET_CATEGORIES = {
+    "Véhicules": 'vehicles',
+    "Motos": 'motorcycles',
+    "Locations": 'rentals',
+}
+WEBSCRAPER_FILES = {
+    'vehicles': DATA_DIR / 'dakar-auto.csv',
+    'motorcycles': DATA_DIR / 'dakar-auto-scooter.csv',
+    'rentals': DATA_DIR / 'dakar-auto-location.csv',
+}
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+def file_version(path):
+    """Clé de version d'un fichier (date de modification), pour invalider les caches."""
+    return Path(path).stat().st_mtime_ns
+
+
+def columnar_path(path):
+    return COLUMNAR_DIR / (Path(path).stem + '.parquet')
+
+
+def load_dataset(path, columnar=True):
+    """Charge un CSV d'annonces nettoyé et typé.
+
+    Avec pyarrow, une copie Parquet typée est conservée et relue tant que le CSV
+    n'a pas été modifié depuis.
+    """
+    path = Path(path)
+    parquet = columnar_path(path)
+    if columnar and HAS_PARQUET and parquet.exists() and parquet.stat().st_mtime_ns >= file_version(path):
+        return pd.read_parquet(parquet)
+
+    df = clean_listings(pd.read_csv(path))
+    if columnar and HAS_PARQUET:
+        parquet.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(parquet, index=False)
+    return df
+
+
+def _mean_by_marque(column):
+    def chart(df):
+        return df.groupby('marque', observed=True)[column].mean().sort_values(ascending=False).head(5)
+    return chart
+
+
+# Graphiques du tableau de bord : (titre, calcul) par dataset
+DASHBOARD_CHARTS = {
+    "Véhicules": [
+        ("Top Marques", lambda df: df['marque'].value_counts().head(10)),
+        ("Prix moyen par marque (Top 5)", _mean_by_marque('prix')),
+    ],
+    "Motos": [
+        ("Kilométrage moyen par marque (Top 5)", _mean_by_marque('kilométrage')),
+        ("Distribution des années", lambda df: df['année'].value_counts().sort_index()),
+    ],
+    "Locations": [
+        ("Répartition par propriétaires", lambda df: df['propriétaire'].value_counts().head(10)),
+        ("Prix moyen par marque", _mean_by_marque('prix')),
+    ],
+}
+
+
+def compute_charts(df, dataset):
+    """Précalcule les agrégats du tableau de bord : liste de (titre, Series)."""
+    return [(title, chart(df)) for title, chart in DASHBOARD_CHARTS[dataset]]
+
+
+# Mêmes graphiques calculés dans la base locale : (titre, paramètres de ListingStore.aggregate)
+STORE_CHARTS = {
+    "Véhicules": [
+        ("Top Marques", dict(group='marque', limit=10)),
+        ("Prix moyen par marque (Top 5)", dict(group='marque', value='AVG(prix)', limit=5)),
+    ],
+    "Motos": [
+        ("Kilométrage moyen par marque (Top 5)", dict(group='marque', value='AVG(kilometrage)', limit=5)),
+        ("Distribution des années", dict(group='annee', order='key')),
+    ],
+    "Locations": [
+        ("Répartition par propriétaires", dict(group='proprietaire', limit=10)),
+        ("Prix moyen par marque", dict(group='marque', value='AVG(prix)', limit=5)),
+    ],
+}
+
+
+def compute_store_charts(store, dataset, **filters):
+    """Agrégats du tableau de bord calculés par la base locale : liste de (titre, Series)."""
+    category = DATASET_CATEGORIES[dataset]
+    return [(title, store.aggregate(category, **spec, **filters)) for title, spec in STORE_CHARTS[dataset]]
@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+from .fetch import DEFAULT_RATE, HostLimiter
+from .parse import make_soup
+from .pipeline import DEFAULT_WORKERS, get_parse_pool, submit_parse
+from .schema import BASE_URL, URL_COLUMN
+
+# Page de détail d'une annonce : bloc principal, liste des caractéristiques, description
+DETAIL_CONTENT = ('div', "listing-item")
+DETAIL_SPECS = ('ul', "listing-item__specs")
+DESCRIPTION = ('div', "listing-item__description")
+
+# Libellés des caractéristiques (sans accents, en minuscules) -> colonnes
+SPEC_COLUMNS = {
+    'marque': 'marque',
+    'modele': 'modèle',
+    'annee': 'année',
+    'kilometrage': 'kilométrage',
+    'boite de vitesse': 'boite vitesse',
+    'boite vitesse': 'boite vitesse',
+    'transmission': 'boite vitesse',
+    'carburant': 'carburant',
+    'couleur': 'couleur',
+    'cylindree': 'cylindrée',
+    'nombre de portes': 'portes',
+    'portes': 'portes',
+    'etat': 'état',
+}
+
+# Annonces par page de liste : chaque page de liste entraîne autant de pages de détail
+LISTINGS_PER_PAGE = 20
+
+# Limites propres aux pages de détail, dimensionnées pour suivre le débit des pages
+# de liste (sinon le scraping attend les pages de détail après la dernière page)
+DEFAULT_DETAIL_CONCURRENCY = 12
+DEFAULT_DETAIL_RATE = LISTINGS_PER_PAGE * DEFAULT_RATE
+
+# Nombre d'URL mémorisées pour la déduplication
+MAX_SEEN = 10000
+
+# Taille du pool de connexions de la session des pages de détail (maximum du réglage de concurrence)
+MAX_DETAIL_CONCURRENCY = 16
+
+# Résultat d'une page de détail ; `elapsed` couvre récupération et parsing
+DetailResult = namedtuple('DetailResult', ['url', 'specs', 'elapsed', 'size', 'from_cache'])
+
+
+def _label_key(label):
+    text = unicodedata.normalize('NFKD', label).encode('ascii', 'ignore').decode()
+    return re.sub(r'\s+', ' ', text).strip(' :').lower()
+
+
+def parse_detail(markup, encoding=None):
+    """Caractéristiques d'une page de détail : dict colonne -> texte ; exécuté dans un processus de parsing."""
+    soup = make_soup(markup, only=DETAIL_CONTENT, encoding=encoding)
+    specs = {}
+    container = soup.find(DETAIL_SPECS[0], class_=DETAIL_SPECS[1])
+    for item in container.find_all('li') if container else ():
+        parts = [child.get_text(' ', strip=True) for child in item.find_all(True, recursive=False)]
+        if len(parts) >= 2:
+            label, value = parts[0], ' '.join(parts[1:])
+        else:
+            label, _, value = item.get_text(' ', strip=True).partition(':')
+        key = _label_key(label)
+        if key and value.strip():
+            specs[SPEC_COLUMNS.get(key, key)] = value.strip(' :')
+    description = soup.find(DESCRIPTION[0], class_=DESCRIPTION[1])
+    if description is not None:
+        specs['description'] = description.get_text(' ', strip=True)
+    return specs
+
+
+def detail_url(link, base_url=None):
+    """Lien d'une annonce, réécrit vers le site scrappé (`base_url` ou BASE_URL : miroir, serveur local)."""
+    base = urlsplit(base_url or BASE_URL)
+    parts = urlsplit(link)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+class DetailCrawler:
+    """File bornée de récupération des pages de détail, dédupliquée par URL.
+
+    Les pages sont récupérées par `concurrency` threads sous les limites de l'hôte,
+    en parallèle des pages de liste, puis parsées par le pool de processus. Au-delà
+    de `max_pending` pages en attente, `submit` bloque l'appelant. Une URL déjà
+    demandée à ce crawler n'est récupérée qu'une fois : un crawler sert un seul
+    scraping, pour que les scrapings suivants repassent par le cache HTTP et sa
+    revalidation. `close` arrête ses threads.
+    """
+
+    def __init__(self, fetch, concurrency=DEFAULT_DETAIL_CONCURRENCY, rate=DEFAULT_DETAIL_RATE,
+                 workers=DEFAULT_WORKERS, max_pending=None, max_seen=MAX_SEEN):
+        self.fetch = fetch
+        self.workers = workers
+        self.max_seen = max_seen
+        self._limiter = HostLimiter(concurrency, rate)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='detail')
+        self._slots = threading.BoundedSemaphore(max_pending or 4 * concurrency)
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, url):
+        """Programme la récupération de `url` ; renvoie (future de DetailResult, nouvelle demande ?)."""
+        with self._lock:
+            if url in self._seen:
+                self._seen.move_to_end(url)
+                return self._seen[url], False
+        self._slots.acquire()
+        with self._lock:
+            if url in self._seen:
+                self._slots.release()
+                return self._seen[url], False
+            future = self._executor.submit(self._task, url)
+            self._seen[url] = future
+            while len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+        future.add_done_callback(lambda f: self._done(url, f))
+        return future, True
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _done(self, url, future):
+        self._slots.release()
+        if future.exception() is not None:
+            # Une page en échec pourra être redemandée
+            with self._lock:
+                if self._seen.get(url) is future:
+                    del self._seen[url]
+
+    def _task(self, url):
+        response, error, elapsed = self._limiter.run(url, self.fetch)
+        if error is not None:
+            raise error
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code} pour {url}")
+        start = time.perf_counter()
+        specs = submit_parse(get_parse_pool(self.workers), parse_detail, response.content, response.encoding).result()
+        return DetailResult(url, specs, elapsed + time.perf_counter() - start, len(response.content),
+                            getattr(response, 'from_cache', False))
+
+
+def enrich_listings(df, details):
+    """Complète les annonces brutes avec les caractéristiques de détail (jointure sur le lien).
+
+    `details` est un DataFrame avec la colonne du lien ; ses valeurs remplacent celles
+    déduites de la carte (année tirée du titre...) et ses colonnes nouvelles sont ajoutées.
+    """
+    from .clean import COLUMN_ALIASES
+
+    if details.empty:
+        return df
+    df = df.rename(columns=lambda c: COLUMN_ALIASES.get(c, c))
+    details = details.drop_duplicates(URL_COLUMN).set_index(URL_COLUMN)
+    matched = details.reindex(df[URL_COLUMN]).set_axis(df.index)
+    for column in details.columns:
+        values = matched[column]
+        df[column] = values.where(values.notna(), df[column]) if column in df else values
+    return df
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_detail_client(use_cache=True):
+    """Renvoie la session HTTP partagée des pages de détail (connexions réutilisées entre les scrapings)."""
+    from .session import HttpClient, get_cache
+
+    with _clients_lock:
+        if use_cache not in _clients:
+            # Session dédiée : les threads de détail n'attendent pas les connexions des pages de liste
+            _clients[use_cache] = HttpClient(pool_size=MAX_DETAIL_CONCURRENCY,
+                                             cache=get_cache() if use_cache else None)
+        return _clients[use_cache]
@@ -0,0 +1,36 @@
+import hashlib
+import io
+
+import pandas as pd
+
+from .datasets import HAS_PARQUET
+
+# Formats d'export : libellé -> (extension, type MIME)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+}
+if HAS_PARQUET:
+    EXPORT_FORMATS['Parquet'] = ('parquet', 'application/vnd.apache.parquet')
+
+
+def dataset_hash(df):
+    """Empreinte du contenu d'un DataFrame (valeurs et colonnes), calculée de façon vectorisée."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('\x1f'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def export_bytes(df, fmt):
+    """Sérialise `df` au format `fmt` (clé de EXPORT_FORMATS) dans un tampon mémoire unique."""
+    buffer = io.BytesIO()
+    if fmt == 'CSV':
+        df.to_csv(buffer, index=False, encoding='utf-8')
+    elif fmt == 'CSV (gzip)':
+        df.to_csv(buffer, index=False, encoding='utf-8', compression={'method': 'gzip', 'mtime': 0})
+    elif fmt == 'Parquet':
+        df.to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+    return buffer.getvalue()
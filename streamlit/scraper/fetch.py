@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+# Valeurs par défaut du moteur de récupération
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0
+
+# Résultat d'une page récupérée (response vaut None en cas d'erreur) ; `elapsed` est la
+# durée des requêtes elles-mêmes (toutes tentatives), hors attentes du limiteur et du backoff
+FetchResult = namedtuple('FetchResult', ['key', 'url', 'response', 'error', 'elapsed'])
+
+
+class TokenBucket:
+    """Limiteur de débit à jetons : `rate` requêtes/seconde, rafales jusqu'à `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Limite de concurrence et de débit par hôte, partagée entre les threads."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+        self.concurrency = concurrency
+        self.rate = rate
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _for_host(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.concurrency), TokenBucket(self.rate))
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url, timings=None):
+        """Place et jeton de l'hôte pour une requête ; la durée passée dans le créneau,
+        hors attente, est ajoutée à `timings` si fourni."""
+        semaphore, bucket = self._for_host(urlsplit(url).netloc)
+        with semaphore:
+            bucket.acquire()
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                if timings is not None:
+                    timings.append(time.perf_counter() - start)
+
+    def run(self, url, fetch):
+        """Exécute `fetch(url)` sous les limites de l'hôte ; renvoie (réponse, erreur, durée).
+
+        Un `fetch` marqué `limited` (HttpClient.get) reçoit `slot` et prend un créneau
+        par tentative : ses relances consomment des jetons et ses attentes de backoff
+        ne bloquent pas les autres requêtes vers l'hôte.
+        """
+        timings = []
+        try:
+            if getattr(fetch, 'limited', False):
+                response = fetch(url, slot=lambda: self.slot(url, timings))
+            else:
+                with self.slot(url, timings):
+                    response = fetch(url)
+            return response, None, sum(timings)
+        except Exception as e:
+            return None, e, sum(timings)
+
+
+def fetch_pages(pages, fetch=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """Récupère les pages `(key, url)` en parallèle et les renvoie au fil de l'eau.
+
+    Les résultats arrivent dans l'ordre de complétion, pas dans l'ordre des pages :
+    l'appelant se sert de `key` pour les remettre en ordre.
+    """
+    if fetch is None:
+        import requests
+        fetch = requests.get
+    pages = list(pages)
+    limiter = HostLimiter(concurrency, rate)
+
+    def task(key, url):
+        return FetchResult(key, url, *limiter.run(url, fetch))
+
+    if not pages:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pages)))) as executor:
+        futures = [executor.submit(task, key, url) for key, url in pages]
+        for future in as_completed(futures):
+            yield future.result()
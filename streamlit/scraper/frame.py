@@ -0,0 +1,50 @@
+from itertools import chain
+
+import pandas as pd
+
+
+class ColumnBuffer:
+    """Accumule les lignes d'un scraping par colonnes, page par page.
+
+    Les lots de lignes (tuples) sont transposés à l'arrivée ; le DataFrame est
+    reconstruit dans l'ordre des pages, quel que soit l'ordre d'arrivée. Les valeurs
+    restent le texte brut des cartes : le typage est fait une fois, par clean_listings.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._pages = {}
+        self._rows = 0
+
+    def __len__(self):
+        return self._rows
+
+    def extend(self, key, rows):
+        if not rows:
+            return
+        self._pages[key] = list(zip(*rows))
+        self._rows += len(rows)
+
+    def to_frame(self, last=None):
+        """DataFrame des lignes accumulées ; avec `last`, seulement les `last` dernières
+        (aperçu en cours de scraping, construit sans recopier tout le buffer)."""
+        keys = sorted(self._pages)
+        if last is not None:
+            kept, count = [], 0
+            for key in reversed(keys):
+                if count >= last:
+                    break
+                kept.append(key)
+                count += len(self._pages[key][0])
+            keys = kept[::-1]
+        data = {column: list(chain.from_iterable(self._pages[key][i] for key in keys))
+                for i, column in enumerate(self.columns)}
+        df = pd.DataFrame(data, columns=self.columns)
+        if last is None:
+            return df
+        df.index += self._rows - len(df)
+        return df.tail(last)
+
+    def clear(self):
+        self._pages.clear()
+        self._rows = 0
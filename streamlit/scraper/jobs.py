@@ -0,0 +1,164 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_PATH
+from .clean import clean_listings
+from .datasets import HAS_PARQUET
+from .metrics import Metrics
+from .schema import CATEGORIES
+
+JOBS_DIR = DEFAULT_CACHE_PATH.parent / 'jobs'
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+RESULT_NAME = 'result.parquet' if HAS_PARQUET else 'result.csv.gz'
+
+# États d'une tâche
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+# Nombre de messages de page conservés dans l'état de la tâche
+MAX_MESSAGES = 50
+
+
+def job_dir(job_id, root=JOBS_DIR):
+    return Path(root) / job_id
+
+
+def _write(job, root=JOBS_DIR):
+    path = job_dir(job['id'], root) / 'job.json'
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(job, ensure_ascii=False, indent=2), encoding='utf-8')
+    # Remplacement atomique : l'application ne lit jamais un état à moitié écrit
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid):
+    if os.name != 'posix' or not pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def load_job(job_id, root=JOBS_DIR):
+    job = json.loads((job_dir(job_id, root) / 'job.json').read_text(encoding='utf-8'))
+    if job['status'] == RUNNING and not _pid_alive(job.get('pid')):
+        job['status'] = FAILED
+        job['error'] = "Processus de scraping interrompu."
+    return job
+
+
+def list_jobs(root=JOBS_DIR):
+    """Tâches connues, de la plus récente à la plus ancienne."""
+    root = Path(root)
+    if not root.exists():
+        return []
+    jobs = [load_job(path.parent.name, root) for path in root.glob('*/job.json')]
+    return sorted(jobs, key=lambda job: job['created'], reverse=True)
+
+
+def create_job(category, first_page, last_page, options=None, root=JOBS_DIR):
+    if category not in CATEGORIES:
+        raise ValueError(f"Catégorie inconnue : {category}")
+    job_id = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+    job_dir(job_id, root).mkdir(parents=True)
+    job = {
+        'id': job_id,
+        'category': category,
+        'first_page': first_page,
+        'last_page': last_page,
+        'options': options or {},
+        'status': PENDING,
+        'created': time.time(),
+        'started': None,
+        'finished': None,
+        'pid': None,
+        'pages_done': 0,
+        'pages_total': last_page - first_page + 1,
+        'details_done': 0,
+        'details_total': 0,
+        'rows': 0,
+        'messages': [],
+        'error': None,
+        'result': None,
+        'metrics': None,
+    }
+    _write(job, root)
+    return job
+
+
+def start_job(job, root=JOBS_DIR):
+    """Lance la tâche dans un processus séparé, détaché de l'appelant."""
+    directory = job_dir(job['id'], root)
+    with open(directory / 'worker.log', 'ab') as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'scraper', '--job', job['id'], '--jobs-dir', str(root)],
+            cwd=str(PACKAGE_ROOT), stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            start_new_session=True)
+    # Le worker enregistre lui-même son état : on ne réécrit pas job.json ici
+    job['pid'] = process.pid
+    return job
+
+
+def submit_job(category, first_page, last_page, root=JOBS_DIR, **options):
+    """Crée une tâche de scraping et la lance en arrière-plan ; renvoie son état initial."""
+    return start_job(create_job(category, first_page, last_page, options, root), root)
+
+
+def run_job(job_id, root=JOBS_DIR):
+    """Exécute une tâche (dans le processus worker) en persistant sa progression."""
+    # Import local : la page des tâches de l'application n'a pas à charger requests ni bs4
+    from .runner import page_messages, scrape, write_output
+
+    job = load_job(job_id, root)
+    job.update(status=RUNNING, started=time.time(), pid=os.getpid())
+    _write(job, root)
+    schema = CATEGORIES[job['category']]
+    metrics = Metrics()
+
+    def on_page(page, done, total, buffer):
+        job['pages_done'] = done
+        job['rows'] = len(buffer)
+        job['messages'] = (job['messages'] + [text for _, text in page_messages(schema, page)])[-MAX_MESSAGES:]
+        job['metrics'] = metrics.snapshot()
+        _write(job, root)
+
+    last_write = 0.0
+
+    def on_detail(done, total):
+        # Une écriture par seconde au plus : il y a environ 20 pages de détail par page de liste
+        nonlocal last_write
+        job.update(details_done=done, details_total=total)
+        if done == total or time.monotonic() - last_write >= 1.0:
+            last_write = time.monotonic()
+            _write(job, root)
+
+    try:
+        df = scrape(schema, job['first_page'], job['last_page'], on_page=on_page, on_detail=on_detail,
+                    metrics=metrics, **job['options'])
+        result = job_dir(job_id, root) / RESULT_NAME
+        write_output(df, result)
+        job.update(status=DONE, rows=len(df), result=result.name)
+    except Exception as e:
+        job.update(status=FAILED, error=f"{type(e).__name__}: {e}")
+    job['finished'] = time.time()
+    job['metrics'] = metrics.snapshot()
+    _write(job, root)
+    return job
+
+
+def load_result(job, root=JOBS_DIR):
+    """Charge le résultat d'une tâche terminée."""
+    path = job_dir(job['id'], root) / job['result']
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return clean_listings(pd.read_csv(path))
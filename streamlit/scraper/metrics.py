@@ -0,0 +1,153 @@
+import json
+import math
+import threading
+from bisect import bisect_left
+
+# Bornes des histogrammes de latence, en secondes (à la Prometheus)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Étapes du pipeline instrumentées
+STAGES = ('fetch', 'parse', 'extract', 'detail', 'frame')
+
+# Compteurs (nom -> libellé)
+COUNTERS = {
+    'pages_ok': "Pages récupérées",
+    'pages_failed': "Pages en échec",
+    'cards_parsed': "Cartes extraites",
+    'cards_failed': "Cartes en erreur",
+    'cards_without_id': "Cartes sans identifiant",
+    'bytes_downloaded': "Octets téléchargés",
+    'cache_hits': "Réponses du cache HTTP",
+    'details_ok': "Pages de détail",
+    'details_empty': "Pages de détail sans caractéristiques",
+    'details_failed': "Pages de détail en échec",
+    'details_deduplicated': "Pages de détail dédupliquées",
+}
+
+PROMETHEUS_PREFIX = 'dakar_scraper'
+
+
+class Histogram:
+    """Histogramme cumulatif de durées : nombre d'observations par borne supérieure."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Quantile estimé par interpolation linéaire dans le bucket concerné."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                low = self.buckets[i - 1] if i else 0.0
+                high = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max if self.count else None,
+        }
+
+
+class Metrics:
+    """Compteurs et histogrammes de latence d'un scraping, partageables entre threads."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.histograms = {stage: Histogram(buckets) for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self.histograms[stage].observe(seconds)
+
+    def record_page(self, page):
+        """Enregistre les mesures d'un PageResult : récupération, parsing et extraction."""
+        result = page.fetch
+        self.observe('fetch', result.elapsed)
+        response = result.response
+        if result.error is not None or page.rows is None:
+            self.inc('pages_failed')
+        else:
+            self.inc('pages_ok')
+            self.inc('cards_parsed', len(page.rows))
+            self.inc('cards_failed', len(page.errors))
+        if response is not None and getattr(response, 'from_cache', False):
+            self.inc('cache_hits')
+        elif response is not None:
+            self.inc('bytes_downloaded', len(response.content))
+        for stage, seconds in (page.timings or {}).items():
+            self.observe(stage, seconds)
+
+    def record_detail(self, result):
+        """Enregistre les mesures d'un DetailResult (page de détail récupérée et parsée).
+
+        Une page dont aucune caractéristique n'a été reconnue (sélecteurs périmés) est
+        comptée à part, dans `details_empty`.
+        """
+        self.observe('detail', result.elapsed)
+        self.inc('details_ok' if result.specs else 'details_empty')
+        if result.from_cache:
+            self.inc('cache_hits')
+        else:
+            self.inc('bytes_downloaded', result.size)
+
+    def snapshot(self):
+        """État courant sous forme de dict sérialisable en JSON."""
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'stages': {stage: histogram.summary() for stage, histogram in self.histograms.items()},
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """Export au format texte de Prometheus."""
+        lines = []
+        with self._lock:
+            for name, value in self.counters.items():
+                metric = f'{prefix}_{name}_total'
+                lines += [f'# HELP {metric} {COUNTERS.get(name, name)}', f'# TYPE {metric} counter',
+                          f'{metric} {value}']
+            metric = f'{prefix}_stage_duration_seconds'
+            lines += [f'# HELP {metric} Durée des étapes du scraping', f'# TYPE {metric} histogram']
+            for stage, histogram in self.histograms.items():
+                cumulative = 0
+                for bound, n in zip(histogram.buckets + (math.inf,), histogram.counts):
+                    cumulative += n
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Écrit les métriques en JSON (extension .json) ou au format Prometheus (autres extensions)."""
+        text = self.to_json() if str(path).lower().endswith('.json') else self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
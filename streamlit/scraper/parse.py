@@ -0,0 +1,25 @@
+from importlib.util import find_spec
+
+# lxml est utilisé s'il est installé, sinon on se rabat sur html.parser ; bs4 et
+# lxml ne sont importés qu'au premier parsing
+DEFAULT_PARSER = 'lxml' if find_spec('lxml') else 'html.parser'
+
+# Conteneurs des cartes d'annonces, par type de page
+VEHICLE_CARD = ('div', "listings-cards__list-item mb-md-3 mb-3")
+LISTING_CARD = ('div', "listing-card__content__inner")
+
+
+def make_soup(markup, parser=None, only=None, encoding=None):
+    """Construit l'arbre de la page, limité au sous-arbre `only` (nom, classe) si fourni."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = SoupStrainer(only[0], class_=only[1]) if only else None
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, parser or DEFAULT_PARSER, parse_only=parse_only, from_encoding=encoding)
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER, parse_only=parse_only)
+
+
+def parse_cards(markup, card, parser=None, restrict=True, encoding=None):
+    """Renvoie les cartes d'annonces `card` (nom, classe) d'une page HTML."""
+    soup = make_soup(markup, parser=parser, only=card if restrict else None, encoding=encoding)
+    return soup.find_all(card[0], class_=card[1])
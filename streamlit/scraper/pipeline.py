@@ -0,0 +1,162 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from .fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE, fetch_pages
+from .parse import LISTING_CARD, parse_cards
+from .schema import CATEGORIES, ID_COLUMN, MISSING
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Résultat d'une page : `fetch` est le FetchResult, `rows` des tuples dans l'ordre
+# des colonnes du schéma, `errors` les messages d'erreur par carte (ou de page),
+# `timings` les durées des étapes parse et extract en secondes, `new` le masque des
+# lignes nouvelles en mode incrémental (None : toutes)
+PageResult = namedtuple('PageResult', ['key', 'fetch', 'rows', 'errors', 'timings', 'new'], defaults=(None, None))
+
+
+def new_rows(page):
+    """Lignes nouvelles d'une page (toutes hors mode incrémental)."""
+    if page.new is None or page.rows is None:
+        return page.rows
+    return [row for row, new in zip(page.rows, page.new) if new]
+
+
+def parse_page(category, body, encoding=None):
+    """Parse une page et renvoie (lignes, erreurs, durées) ; exécuté dans un processus de parsing."""
+    schema = CATEGORIES[category]
+    start = time.perf_counter()
+    cards = parse_cards(body, schema.card, encoding=encoding)
+    parsed = time.perf_counter()
+    rows, errors = schema.extract_all(cards)
+    timings = {'parse': parsed - start, 'extract': time.perf_counter() - parsed}
+    return rows, [str(e) for e in errors], timings
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers=DEFAULT_WORKERS):
+    """Renvoie le pool de processus de parsing partagé pour `workers` processus (None si 0).
+
+    Un pool par nombre de processus, jamais arrêté pendant la vie du processus : deux
+    sessions réglées différemment ne s'interrompent pas l'une l'autre.
+    """
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if workers not in _pools:
+            # spawn : pas de fork d'un processus multi-thread (serveur Streamlit)
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pools[workers]
+
+
+def shutdown_parse_pools():
+    """Arrête tous les pools de parsing (fin d'un processus qui doit pouvoir se terminer)."""
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def submit_parse(pool, fn, *args):
+    """Soumet `fn(*args)` au pool ; si le pool est arrêté ou cassé, exécute sur place
+    et renvoie une future déjà résolue."""
+    if pool is not None:
+        try:
+            return pool.submit(fn, *args)
+        except RuntimeError:  # pool arrêté ou BrokenProcessPool
+            pass
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _load_parsers(_):
+    # Premier parsing : importe bs4 et lxml dans le processus
+    parse_cards(b'<html></html>', LISTING_CARD)
+
+
+def warm_parse_pool(workers=DEFAULT_WORKERS):
+    """Démarre les processus de parsing et y charge les parseurs ; renvoie le pool (None si `workers` vaut 0)."""
+    pool = get_parse_pool(workers)
+    if pool is not None:
+        list(pool.map(_load_parsers, range(workers)))
+    return pool
+
+
+def _page_result(future):
+    result = future.fetch_result
+    try:
+        rows, errors, timings = future.result()
+    except Exception as e:
+        return PageResult(result.key, result, None, [str(e)])
+    return PageResult(result.key, result, rows, errors, timings)
+
+
+def scrape_pages(schema, pages, fetch=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, pool=None):
+    """Pipeline récupération -> parsing : les pages `(key, url)` sont récupérées par des
+    threads et parsées par le `pool` de processus (ou sur place sans pool).
+
+    Renvoie des PageResult au fil de l'eau ; `rows` vaut None si la page n'a pas été parsée.
+    """
+    pending = set()
+    for result in fetch_pages(pages, fetch=fetch, concurrency=concurrency, rate=rate):
+        if result.error is not None or result.response.status_code != 200:
+            yield PageResult(result.key, result, None, [])
+        elif pool is None:
+            try:
+                rows, errors, timings = parse_page(schema.name, result.response.content, result.response.encoding)
+                yield PageResult(result.key, result, rows, errors, timings)
+            except Exception as e:
+                yield PageResult(result.key, result, None, [str(e)])
+        else:
+            future = submit_parse(pool, parse_page, schema.name, result.response.content, result.response.encoding)
+            future.fetch_result = result
+            pending.add(future)
+
+        done = {future for future in pending if future.done()}
+        pending -= done
+        for future in done:
+            yield _page_result(future)
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield _page_result(future)
+
+
+def crawl_incremental(schema, page_numbers, known, batch_size=DEFAULT_CONCURRENCY, base_url=None, **kwargs):
+    """Crawl incrémental : marque les annonces absentes de `known` et s'arrête
+    après le premier lot de pages contenant une page entièrement déjà vue.
+
+    Les pages gardent toutes leurs lignes (pour rafraîchir la base locale) ; `new`
+    indique celles qui sont nouvelles (voir new_rows). Une carte
+    sans identifiant ne compte pas comme nouvelle : si aucun lien n'est reconnu, le
+    crawl s'arrête au premier lot au lieu de parcourir toutes les pages.
+
+    Les pages `page_numbers` sont récupérées par lots de `batch_size` ; `kwargs` est
+    passé à scrape_pages.
+    """
+    id_index = schema.columns.index(ID_COLUMN)
+    page_numbers = list(page_numbers)
+    for start in range(0, len(page_numbers), batch_size):
+        pages = [(p, schema.page_url(p, base_url)) for p in page_numbers[start:start + batch_size]]
+        stop = False
+        for page in scrape_pages(schema, pages, **kwargs):
+            if page.rows:
+                new = [row[id_index] not in known for row in page.rows]
+                stop = stop or not any(is_new and row[id_index] != MISSING
+                                       for row, is_new in zip(page.rows, new))
+                page = page._replace(new=new)
+            yield page
+        if stop:
+            return
@@ -0,0 +1,161 @@
+import time
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from .clean import clean_listings
+from .detail import (
+    DEFAULT_DETAIL_CONCURRENCY, DEFAULT_DETAIL_RATE, DetailCrawler, detail_url, enrich_listings, get_detail_client,
+)
+from .export import EXPORT_FORMATS, export_bytes
+from .fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE
+from .frame import ColumnBuffer
+from .pipeline import DEFAULT_WORKERS, crawl_incremental, get_parse_pool, new_rows, scrape_pages
+from .schema import ID_COLUMN, MISSING, URL_COLUMN
+from .seen import get_seen_index
+from .session import get_client
+from .store import get_store
+
+
+def iter_scrape(schema, first_page=1, last_page=1, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                use_cache=True, workers=DEFAULT_WORKERS, incremental=False, base_url=None):
+    """PageResult des pages `first_page`..`last_page` d'une catégorie, au fil de l'eau."""
+    client = get_client(concurrency, use_cache)
+    options = dict(fetch=client.get, concurrency=concurrency, rate=rate, pool=get_parse_pool(workers))
+    page_numbers = range(first_page, last_page + 1)
+    if incremental:
+        known = get_seen_index().ids(schema.name)
+        return crawl_incremental(schema, page_numbers, known, batch_size=concurrency, base_url=base_url, **options)
+    return scrape_pages(schema, [(p, schema.page_url(p, base_url)) for p in page_numbers], **options)
+
+
+def _missing_ids(schema, page):
+    """Nombre de cartes d'une page dont le lien (et donc l'identifiant) est introuvable."""
+    id_index = schema.columns.index(ID_COLUMN)
+    return sum(row[id_index] == MISSING for row in page.rows or ())
+
+
+def page_messages(schema, page):
+    """Messages (niveau, texte) décrivant le traitement d'une page ; niveau : info, warning ou error."""
+    if page.fetch.error is not None:
+        return [('error', f"Erreur lors du scraping de la page {page.key}: {page.fetch.error}")]
+    if page.rows is None and not page.errors:
+        return [('warning', f"Page {page.key} est indisponible.")]
+    if page.rows is None:
+        return [('error', f"Erreur lors du scraping de la page {page.key}: {page.errors[0]}")]
+    messages = [('info', f"Page {page.key} a été scrappée.")]
+    missing = _missing_ids(schema, page)
+    if missing:
+        messages.append(('warning', f"Page {page.key} : {missing} annonce(s) sans lien, non enregistrée(s)."))
+    return messages + [('error', f"Erreur lors du scraping {schema.label}: {e}") for e in page.errors]
+
+
+def _collect_details(futures, metrics=None, on_detail=None):
+    """DataFrame (lien + caractéristiques) des pages de détail demandées ; les échecs sont ignorés.
+
+    `futures` associe chaque lien à (future, nouvelle demande ?) ; seules les pages
+    effectivement récupérées pendant ce scraping sont comptées dans `metrics`.
+    `on_detail(done, total)` est appelé à chaque page de détail terminée.
+    """
+    if on_detail is not None:
+        unique = {future for future, _ in futures.values()}
+        remaining = {future for future in unique if not future.done()}
+        done = len(unique) - len(remaining)
+        for _ in as_completed(remaining):
+            done += 1
+            on_detail(done, len(unique))
+    records = []
+    for link, (future, new) in futures.items():
+        try:
+            result = future.result()
+        except Exception:
+            if metrics is not None and new:
+                metrics.inc('details_failed')
+            continue
+        if metrics is not None and new:
+            metrics.record_detail(result)
+        records.append({URL_COLUMN: link, **result.specs})
+    return pd.DataFrame.from_records(records, columns=None if records else [URL_COLUMN])
+
+
+def scrape(schema, first_page=1, last_page=1, on_page=None, persist=True, metrics=None, details=False,
+           detail_concurrency=DEFAULT_DETAIL_CONCURRENCY, detail_rate=DEFAULT_DETAIL_RATE, on_detail=None, **options):
+    """Scrape une plage de pages et renvoie le DataFrame nettoyé, dans l'ordre des pages.
+
+    `on_page(page, done, total, buffer)` est appelé après chaque page traitée. Avec
+    `persist`, chaque page est enregistrée dans la base locale des annonces (en mode
+    incrémental aussi les annonces déjà vues, pour suivre leurs prix) et les nouveaux
+    identifiants dans l'index des annonces vues. Le DataFrame renvoyé ne contient que
+    les annonces nouvelles en mode incrémental. Avec `details`, la page de chaque
+    annonce est récupérée en parallèle des pages de liste (sous ses propres limites
+    `detail_concurrency` et `detail_rate`) et ses caractéristiques complètent les
+    lignes ; `on_detail(done, total)` suit leur progression, après chaque page de
+    liste puis à chaque page de détail terminée. Les compteurs et durées par étape
+    sont ajoutés à `metrics` (un objet Metrics) s'il est fourni.
+    """
+    buffer = ColumnBuffer(schema.columns)
+    store = get_store() if persist else None
+    crawler = DetailCrawler(get_detail_client(options.get('use_cache', True)).get, detail_concurrency, detail_rate,
+                            options.get('workers', DEFAULT_WORKERS)) if details else None
+    url_index = schema.columns.index(URL_COLUMN)
+    detail_futures = {}
+    total = last_page - first_page + 1
+    frame_time = 0.0
+    try:
+        for done, page in enumerate(iter_scrape(schema, first_page, last_page, **options), 1):
+            if metrics is not None:
+                metrics.record_page(page)
+                metrics.inc('cards_without_id', _missing_ids(schema, page))
+            if page.rows is not None:
+                rows = new_rows(page)
+                start = time.perf_counter()
+                buffer.extend(page.key, rows)
+                frame_time += time.perf_counter() - start
+                if store is not None and page.rows:
+                    records = pd.DataFrame.from_records(page.rows, columns=schema.columns)
+                    store.upsert(schema.name, clean_listings(records))
+                for link in (row[url_index] for row in rows) if crawler else ():
+                    if link == MISSING or link in detail_futures:
+                        continue
+                    detail_futures[link] = crawler.submit(detail_url(link, options.get('base_url')))
+                    if not detail_futures[link][1] and metrics is not None:
+                        metrics.inc('details_deduplicated')
+            if on_page is not None:
+                on_page(page, done, total, buffer)
+            if crawler is not None and on_detail is not None:
+                futures = {future for future, _ in detail_futures.values()}
+                on_detail(sum(future.done() for future in futures), len(futures))
+
+        details_df = _collect_details(detail_futures, metrics, on_detail) if crawler else None
+    finally:
+        if crawler is not None:
+            crawler.close()
+    start = time.perf_counter()
+    df = buffer.to_frame()
+    buffer.clear()
+    if details_df is not None:
+        df = enrich_listings(df, details_df)
+    df = clean_listings(df)
+    frame_time += time.perf_counter() - start
+    if metrics is not None:
+        metrics.observe('frame', frame_time)
+    if store is not None:
+        if details_df is not None:
+            store.upsert(schema.name, df)
+        get_seen_index().add(schema.name, df[ID_COLUMN])
+    return df
+
+
+def format_for_path(path):
+    """Format d'export déduit de l'extension du fichier (csv, csv.gz, parquet)."""
+    name = str(path).lower()
+    for fmt, (extension, _) in EXPORT_FORMATS.items():
+        if name.endswith('.' + extension):
+            return fmt
+    raise ValueError(f"Extension non prise en charge : {path} ({', '.join(e for e, _ in EXPORT_FORMATS.values())})")
+
+
+def write_output(df, path):
+    fmt = format_for_path(path)
+    with open(path, 'wb') as f:
+        f.write(export_bytes(df, fmt))
@@ -0,0 +1,201 @@
+import os
+import re
+
+from .parse import LISTING_CARD, VEHICLE_CARD
+
+# Sélecteurs (balise, classe) des éléments d'une carte d'annonce
+TITLE = ('h2', "listing-card__header__title mb-md-2 mb-0")
+PRICE = ('h3', "listing-card__header__price font-weight-bold text-uppercase mb-0")
+SUBURB = ('span', "town-suburb d-inline-block")
+PROVINCE = ('span', "province font-weight-bold d-inline-block")
+ATTRIBUTE = ('li', "listing-card__attribute list-inline-item")
+AUTHOR = ('p', "time-author m-0")
+# Classe None : toute balise de ce nom, quelle que soit sa classe
+LINK = ('a', None)
+
+MISSING = "---"
+
+# Site scrappé ; surchargeable (serveur local de benchmark, miroir...)
+BASE_URL = os.environ.get('DAKAR_AUTO_BASE_URL', 'https://dakar-auto.com')
+
+# Colonnes communes : identifiant stable de l'annonce et lien vers sa page
+ID_COLUMN = 'annonce'
+URL_COLUMN = 'lien'
+
+_ANNONCE_ID = re.compile(r'annonce-(\d+)')
+
+
+class Field:
+    """Colonne extraite d'une carte.
+
+    `selector` est un sélecteur (balise, classe) ou un tuple de sélecteurs ; `index`
+    choisit l'occurrence voulue et `attr` lit un attribut plutôt que le texte. Avec
+    `pattern` (expression compilée), seules les occurrences dont la valeur y
+    correspond sont retenues. `post` reçoit le(s) valeur(s) trouvée(s) ; avec
+    `words=True` il reçoit les mots du texte, découpé une seule fois par carte.
+    Sans `default`, un élément absent fait échouer l'extraction de la carte.
+    """
+
+    def __init__(self, name, selector, index=0, attr=None, post=None, words=False, default=None, pattern=None):
+        self.name = name
+        self.selectors = selector if isinstance(selector[0], tuple) else (selector,)
+        self.index = index
+        self.attr = attr
+        self.post = post
+        self.words = words
+        self.default = default
+        self.pattern = pattern
+
+    def read(self, element):
+        return element.get(self.attr) if self.attr else element.get_text(strip=True)
+
+
+class Schema:
+    """Description déclarative d'une catégorie d'annonces, compilée une fois."""
+
+    def __init__(self, name, label, url_template, card, fields):
+        self.name = name
+        self.label = label
+        self.url_template = url_template
+        self.card = card
+        self.fields = fields
+        self.columns = [field.name for field in fields]
+        # Compilation : balises et couples (balise, classe) à relever en un seul parcours
+        self._wanted = {selector for field in fields for selector in field.selectors}
+        self._tags = sorted({tag for tag, _ in self._wanted})
+        self._any_class = {tag for tag, cls in self._wanted if cls is None}
+
+    def page_url(self, page, base_url=None):
+        return self.url_template.format(base=(base_url or BASE_URL).rstrip('/'), page=page)
+
+    def extract(self, card):
+        """Extrait une ligne (tuple dans l'ordre des colonnes) d'une carte en un seul parcours."""
+        found = {}
+        for element in card.find_all(self._tags):
+            key = (element.name, ' '.join(element.get('class', ())))
+            if key in self._wanted:
+                found.setdefault(key, []).append(element)
+            if element.name in self._any_class:
+                found.setdefault((element.name, None), []).append(element)
+
+        words = {}
+        row = []
+        for field in self.fields:
+            values = []
+            for selector in field.selectors:
+                elements = found.get(selector, ())
+                if field.pattern is not None:
+                    elements = [e for e in elements if field.pattern.search(field.read(e) or '')]
+                if len(elements) <= field.index:
+                    break
+                value = field.read(elements[field.index])
+                if value is None:
+                    break
+                values.append(value)
+            else:
+                if field.words:
+                    selector = field.selectors[0]
+                    if selector not in words:
+                        words[selector] = values[0].split(' ')
+                    row.append(field.post(words[selector]))
+                else:
+                    row.append(field.post(*values) if field.post else values[0])
+                continue
+            if field.default is None:
+                raise ValueError(f"élément '{field.name}' introuvable")
+            row.append(field.default)
+        return tuple(row)
+
+    def extract_all(self, cards):
+        """Extrait toutes les cartes ; renvoie les lignes et les erreurs par carte."""
+        rows, errors = [], []
+        for card in cards:
+            try:
+                rows.append(self.extract(card))
+            except Exception as e:
+                errors.append(e)
+        return rows, errors
+
+
+def clean_price(text):
+    return text.replace(' ', ' ')
+
+
+def clean_author(text):
+    return text.removeprefix("Par").strip()
+
+
+def join_address(suburb, province):
+    return f"{suburb}, {province}"
+
+
+def annonce_id(url):
+    match = _ANNONCE_ID.search(url)
+    return match.group(1) if match else MISSING
+
+
+def link_fields():
+    # Premier lien de la carte pointant vers une annonce (image ou titre, avec ou sans classe)
+    return [
+        Field(ID_COLUMN, LINK, attr='href', pattern=_ANNONCE_ID, post=annonce_id, default=MISSING),
+        Field(URL_COLUMN, LINK, attr='href', pattern=_ANNONCE_ID, default=MISSING),
+    ]
+
+
+def numeric_word(index):
+    def pick(words):
+        return words[index] if len(words) > index and words[index].isnumeric() else MISSING
+    return pick
+
+
+VEHICLES = Schema(
+    name='vehicles',
+    label="d'un véhicule",
+    url_template="{base}/senegal/voitures-4?&page={page}",
+    card=VEHICLE_CARD,
+    fields=[
+        Field('marque', TITLE, words=True, post=lambda w: w[0]),
+        Field('année', TITLE, words=True, post=numeric_word(2)),
+        Field('prix', PRICE, post=clean_price),
+        Field('adresse', PROVINCE),
+        Field('kilométrage', ATTRIBUTE, index=1, default=MISSING),
+        Field('boite vitesse', ATTRIBUTE, index=2, default=MISSING),
+        Field('carburant', ATTRIBUTE, index=3, default=MISSING),
+        Field('propriétaire', AUTHOR, post=clean_author, default=MISSING),
+        *link_fields(),
+    ],
+)
+
+MOTORCYCLES = Schema(
+    name='motorcycles',
+    label="d'une moto",
+    url_template="{base}/senegal/motos-and-scooters-3?&page={page}",
+    card=LISTING_CARD,
+    fields=[
+        Field('marque', TITLE, words=True, post=lambda w: w[0]),
+        Field('annee', TITLE, words=True, post=lambda w: w[-1]),
+        Field('prix', PRICE, post=clean_price),
+        Field('adresse', (SUBURB, PROVINCE), post=join_address),
+        Field('kilometrage', ATTRIBUTE, index=1, default=MISSING),
+        Field('proprietaire', AUTHOR, post=clean_author),
+        *link_fields(),
+    ],
+)
+
+RENTALS = Schema(
+    name='rentals',
+    label="d'une location",
+    url_template="{base}/senegal/location-de-voitures-19?&page={page}",
+    card=LISTING_CARD,
+    fields=[
+        Field('marque', TITLE, words=True, post=lambda w: w[0] or MISSING),
+        Field('annee', TITLE, words=True, post=lambda w: w[-1] if len(w) > 1 else MISSING),
+        Field('prix', PRICE, post=clean_price),
+        Field('adresse', (SUBURB, PROVINCE), post=join_address),
+        Field('proprietaire', AUTHOR, post=clean_author),
+        *link_fields(),
+    ],
+)
+
+# Catégories disponibles, par nom
+CATEGORIES = {schema.name: schema for schema in (VEHICLES, MOTORCYCLES, RENTALS)}
@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .cache import DEFAULT_CACHE_PATH
+from .schema import MISSING
+
+DEFAULT_SEEN_PATH = DEFAULT_CACHE_PATH.parent / 'seen.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    category TEXT NOT NULL,
+    annonce TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    PRIMARY KEY (category, annonce)
+);
+"""
+
+
+class SeenIndex:
+    """Index persistant des identifiants d'annonces déjà vus, par catégorie."""
+
+    def __init__(self, path=DEFAULT_SEEN_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def ids(self, category):
+        with self._lock:
+            rows = self._conn.execute('SELECT annonce FROM seen WHERE category = ?', (category,)).fetchall()
+        return {annonce for annonce, in rows}
+
+    def add(self, category, ids):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO seen VALUES (?, ?, ?)',
+                [(category, annonce, now) for annonce in ids if annonce and annonce != MISSING])
+            self._conn.commit()
+
+    def clear(self, category=None):
+        with self._lock:
+            if category is None:
+                self._conn.execute('DELETE FROM seen')
+            else:
+                self._conn.execute('DELETE FROM seen WHERE category = ?', (category,))
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_seen_index():
+    """Renvoie l'index partagé, ouvert au premier appel."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SeenIndex()
+        return _index
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .fetch import DEFAULT_CONCURRENCY
+
+# Délais par défaut (connexion, lecture) en secondes
+DEFAULT_TIMEOUT = (5, 20)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+# Statuts considérés comme transitoires
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+USER_AGENT = "my-data-scraper-app (+https://dakar-auto.com)"
+
+
+def parse_retry_after(value):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes d'attente."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """Session HTTP partagée : pool keep-alive, délais par défaut et relances avec backoff.
+
+    Avec un `cache`, les pages encore fraîches sont servies localement et les autres
+    sont revalidées par requête conditionnelle (304 = copie locale réutilisée).
+    Sous un HostLimiter, chaque tentative prend son propre créneau (`slot`) : les
+    relances sont soumises au débit de l'hôte et le backoff se fait hors créneau.
+    """
+
+    def __init__(self, pool_size=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, cache=None):
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, MAX_BACKOFF)
+        # Backoff exponentiel avec jitter complet
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** attempt))
+
+    def get(self, url, slot=None, **kwargs):
+        if self.cache is None:
+            return self._request(url, slot, **kwargs)
+
+        entry = self.cache.get(url)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            return entry.to_response()
+        if entry is not None:
+            kwargs['headers'] = {**entry.validators(), **kwargs.get('headers', {})}
+
+        response = self._request(url, slot, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(url)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    # HostLimiter.run passe `slot` à get : une place et un jeton par tentative
+    get.limited = True
+
+    def _request(self, url, slot=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            with slot() if slot is not None else nullcontext():
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    if last:
+                        raise
+                    response = None
+            if response is not None and (response.status_code not in RETRY_STATUSES or last):
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(self._delay(attempt, response))
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+_cache = None
+
+
+def get_cache():
+    """Renvoie le cache disque partagé, ouvert au premier appel."""
+    global _cache
+    with _clients_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def get_client(pool_size=DEFAULT_CONCURRENCY, use_cache=True):
+    """Renvoie le client partagé pour une configuration donnée (réutilisé entre les reruns)."""
+    cache = get_cache() if use_cache else None
+    key = (pool_size, use_cache)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = HttpClient(pool_size=pool_size, cache=cache)
+        return _clients[key]
@@ -0,0 +1,188 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_PATH
+from .schema import ID_COLUMN, MISSING, URL_COLUMN
+
+DEFAULT_STORE_PATH = DEFAULT_CACHE_PATH.parent / 'listings.sqlite'
+
+# Colonnes du DataFrame nettoyé -> colonnes de la base
+COLUMNS = {
+    ID_COLUMN: 'annonce',
+    'marque': 'marque',
+    'année': 'annee',
+    'prix': 'prix',
+    'kilométrage': 'kilometrage',
+    'boite vitesse': 'boite_vitesse',
+    'carburant': 'carburant',
+    'adresse': 'adresse',
+    'propriétaire': 'proprietaire',
+    URL_COLUMN: 'lien',
+}
+DISPLAY_NAMES = {column: name for name, column in COLUMNS.items()}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    category TEXT NOT NULL,
+    annonce TEXT NOT NULL,
+    marque TEXT,
+    annee INTEGER,
+    prix INTEGER,
+    kilometrage INTEGER,
+    boite_vitesse TEXT,
+    carburant TEXT,
+    adresse TEXT,
+    proprietaire TEXT,
+    lien TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (category, annonce)
+);
+CREATE INDEX IF NOT EXISTS listings_marque ON listings (category, marque);
+CREATE INDEX IF NOT EXISTS listings_annee ON listings (category, annee);
+CREATE INDEX IF NOT EXISTS listings_prix ON listings (category, prix);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    category TEXT NOT NULL,
+    annonce TEXT NOT NULL,
+    prix INTEGER,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS price_history_annonce ON price_history (category, annonce, seen_at);
+
+-- Historique des prix : une entrée à la première vue puis à chaque changement
+CREATE TRIGGER IF NOT EXISTS listings_price_insert AFTER INSERT ON listings BEGIN
+    INSERT INTO price_history VALUES (new.category, new.annonce, new.prix, new.last_seen);
+END;
+CREATE TRIGGER IF NOT EXISTS listings_price_update AFTER UPDATE OF prix ON listings
+WHEN old.prix IS NOT new.prix BEGIN
+    INSERT INTO price_history VALUES (new.category, new.annonce, new.prix, new.last_seen);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO listings ({columns}, category, first_seen, last_seen) VALUES ({placeholders}, ?, ?, ?)
+ON CONFLICT (category, annonce) DO UPDATE SET {updates}, last_seen = excluded.last_seen
+"""
+
+
+def _value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+class ListingStore:
+    """Base SQLite des annonces des trois catégories, clé primaire (catégorie, annonce)."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def upsert(self, category, df):
+        """Insère ou met à jour un lot d'annonces nettoyées ; renvoie le nombre de lignes écrites.
+
+        Les annonces sans identifiant (NA ou '---') sont ignorées : elles partageraient
+        toutes la même clé et s'écraseraient les unes les autres.
+        """
+        names = [name for name in COLUMNS if name in df]
+        if ID_COLUMN not in names or df.empty:
+            return 0
+        ids = df[ID_COLUMN]
+        df = df.loc[ids.notna() & ~ids.isin([MISSING]), names]
+        columns = [COLUMNS[name] for name in names]
+        sql = _UPSERT.format(
+            columns=', '.join(columns),
+            placeholders=', '.join('?' * len(columns)),
+            updates=', '.join(f'{c} = excluded.{c}' for c in columns if c != 'annonce'))
+        now = time.time()
+        rows = [tuple(_value(v) for v in row) + (category, now, now) for row in df.itertuples(index=False)]
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def _where(self, category, marques=None, years=None, prices=None):
+        clauses, params = ['category = ?'], [category]
+        if marques:
+            clauses.append(f"marque IN ({', '.join('?' * len(marques))})")
+            params.extend(marques)
+        for column, bounds in (('annee', years), ('prix', prices)):
+            if bounds:
+                clauses.append(f'{column} BETWEEN ? AND ?')
+                params.extend(bounds)
+        return ' AND '.join(clauses), params
+
+    def query(self, category, limit=None, **filters):
+        """Annonces filtrées (marques, years=(min, max), prices=(min, max)), les plus récentes d'abord."""
+        where, params = self._where(category, **filters)
+        columns = ', '.join(COLUMNS.values())
+        sql = f'SELECT {columns}, first_seen, last_seen FROM listings WHERE {where} ORDER BY last_seen DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        for column in ('first_seen', 'last_seen'):
+            df[column] = pd.to_datetime(df[column], unit='s')
+        return df.rename(columns=DISPLAY_NAMES)
+
+    def aggregate(self, category, group, value='COUNT(*)', order='value DESC', limit=None, **filters):
+        """Agrégat `value` par colonne `group`, calculé dans la base ; renvoie une Series."""
+        where, params = self._where(category, **filters)
+        sql = (f'SELECT {group} AS key, {value} AS value FROM listings '
+               f'WHERE {where} AND {group} IS NOT NULL GROUP BY {group} ORDER BY {order}')
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.Series([v for _, v in rows], index=[k for k, _ in rows], name=DISPLAY_NAMES.get(group, group))
+
+    def bounds(self, category, column):
+        """(min, max) d'une colonne numérique, ou None si la catégorie est vide."""
+        with self._lock:
+            low, high = self._conn.execute(
+                f'SELECT MIN({column}), MAX({column}) FROM listings WHERE category = ?', (category,)).fetchone()
+        return None if low is None else (low, high)
+
+    def marques(self, category):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT DISTINCT marque FROM listings WHERE category = ? AND marque IS NOT NULL ORDER BY marque',
+                (category,)).fetchall()
+        return [marque for marque, in rows]
+
+    def price_history(self, category, annonce):
+        with self._lock:
+            return pd.read_sql_query(
+                'SELECT prix, seen_at FROM price_history WHERE category = ? AND annonce = ? ORDER BY seen_at',
+                self._conn, params=(category, annonce))
+
+    def version(self, category):
+        """Clé de version d'une catégorie (nombre d'annonces, dernière vue), pour les caches."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*), MAX(last_seen) FROM listings WHERE category = ?', (category,)).fetchone()
+
+    def close(self):
+        self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Renvoie la base partagée, ouverte au premier appel."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ListingStore()
+        return _store
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Le paquet scraper est importé depuis le dossier de l'application, comme dans app.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
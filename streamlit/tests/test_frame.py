@@ -0,0 +1,23 @@
+from scraper.frame import ColumnBuffer
+
+
+def test_pages_are_ordered_by_key_whatever_the_arrival_order():
+    buffer = ColumnBuffer(['marque', 'prix'])
+    buffer.extend(2, [('Kia', '3'), ('BMW', '4')])
+    buffer.extend(1, [('Ford', '1'), ('Audi', '2')])
+    buffer.extend(3, [])
+
+    df = buffer.to_frame()
+    assert len(buffer) == 4
+    assert df['marque'].tolist() == ['Ford', 'Audi', 'Kia', 'BMW']
+
+
+def test_preview_keeps_only_the_last_rows():
+    buffer = ColumnBuffer(['marque', 'prix'])
+    for page in range(1, 4):
+        buffer.extend(page, [(f'M{page}{i}', str(i)) for i in range(3)])
+
+    preview = buffer.to_frame(last=4)
+    assert preview['marque'].tolist() == ['M22', 'M30', 'M31', 'M32']
+    assert preview.index.tolist() == [5, 6, 7, 8]
+    assert buffer.to_frame(last=100).equals(buffer.to_frame())
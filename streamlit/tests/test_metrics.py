@@ -0,0 +1,14 @@
+from scraper.detail import DetailResult, parse_detail
+from scraper.metrics import Metrics
+
+
+def test_detail_pages_without_specs_are_counted_apart():
+    metrics = Metrics()
+    metrics.record_detail(DetailResult('/annonce-1', {'carburant': 'Diesel'}, 0.1, 1000, False))
+    metrics.record_detail(DetailResult('/annonce-2', parse_detail(b'<html><body>Nouvelle mise en page</body></html>'),
+                                       0.1, 1000, False))
+
+    counters = metrics.snapshot()['counters']
+    assert counters['details_ok'] == 1
+    assert counters['details_empty'] == 1
+    assert counters['bytes_downloaded'] == 2000
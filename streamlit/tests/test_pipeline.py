@@ -0,0 +1,25 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from scraper.pipeline import get_parse_pool, scrape_pages, shutdown_parse_pools
+from scraper.schema import MOTORCYCLES
+from test_runner import FakeClient
+
+
+def test_pools_of_other_sizes_are_left_running():
+    try:
+        pool = get_parse_pool(2)
+        assert get_parse_pool(3) is not pool
+        assert get_parse_pool(2) is pool
+        assert not pool._shutdown_thread
+    finally:
+        shutdown_parse_pools()
+
+
+def test_pages_are_parsed_in_place_when_the_pool_is_stopped():
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    pool.shutdown()
+    pages = [(1, 'https://dakar-auto.com/senegal/motos-and-scooters-3?&page=1')]
+
+    [page] = scrape_pages(MOTORCYCLES, pages, fetch=FakeClient().get, rate=0, pool=pool)
+    assert len(page.rows) == 20 and page.errors == []
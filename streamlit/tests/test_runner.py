@@ -0,0 +1,64 @@
+import threading
+from pathlib import Path
+
+import requests
+
+import scraper.runner as runner
+from scraper.schema import MOTORCYCLES
+from scraper.seen import SeenIndex
+from scraper.store import ListingStore
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures' / 'motorcycles.html'
+
+
+class FakeClient:
+    def get(self, url):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = FIXTURE.read_bytes()
+        return response
+
+
+def test_incremental_scrape_refreshes_known_listings(tmp_path, monkeypatch):
+    store = ListingStore(tmp_path / 'listings.sqlite')
+    seen = SeenIndex(tmp_path / 'seen.sqlite')
+    monkeypatch.setattr(runner, 'get_store', lambda: store)
+    monkeypatch.setattr(runner, 'get_seen_index', lambda: seen)
+    monkeypatch.setattr(runner, 'get_client', lambda *args: FakeClient())
+    options = dict(rate=0, workers=0, use_cache=False)
+
+    first = runner.scrape(MOTORCYCLES, 1, 1, **options)
+    assert len(first) == 20
+    before = store.query('motorcycles').set_index('annonce')['last_seen']
+
+    again = runner.scrape(MOTORCYCLES, 1, 1, incremental=True, **options)
+    assert again.empty
+    after = store.query('motorcycles').set_index('annonce')['last_seen']
+    assert (after.loc[before.index] > before).all()
+
+
+def test_detail_pages_are_fetched_again_by_each_scrape(monkeypatch):
+    detail = FIXTURE.with_name('detail.html').read_bytes()
+    requested = []
+
+    class FakeDetailClient(FakeClient):
+        def get(self, url):
+            requested.append(url)
+            response = super().get(url)
+            response._content = detail
+            return response
+
+    monkeypatch.setattr(runner, 'get_client', lambda *args: FakeClient())
+    monkeypatch.setattr(runner, 'get_detail_client', lambda *args: FakeDetailClient())
+    options = dict(rate=0, workers=0, use_cache=False, persist=False, details=True, detail_rate=0)
+
+    for _ in range(2):
+        progress = []
+        df = runner.scrape(MOTORCYCLES, 1, 1, on_detail=lambda done, total: progress.append((done, total)), **options)
+        assert df['carburant'].notna().all()
+        assert progress[-1] == (20, 20)
+        assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+    assert len(requested) == 2 * len(set(requested)) == 40
+    assert not [t for t in threading.enumerate() if t.name.startswith('detail')]
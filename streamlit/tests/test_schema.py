@@ -0,0 +1,40 @@
+from bs4 import BeautifulSoup
+
+from scraper.fetch import FetchResult
+from scraper.pipeline import PageResult
+from scraper.runner import page_messages
+from scraper.schema import MISSING, MOTORCYCLES
+
+CARD = """
+<div class="listing-card__content__inner">
+  <a class="listing-card__image" href="/senegal/motos/bmw/gs/annonce-139070"><img alt="BMW GS 2021"></a>
+  <h2 class="listing-card__header__title mb-md-2 mb-0">
+    <a class="stretched-link" href="/senegal/motos/bmw/gs/annonce-139070">BMW GS 2021</a>
+  </h2>
+  <h3 class="listing-card__header__price font-weight-bold text-uppercase mb-0">2 500 000 F CFA</h3>
+  <span class="town-suburb d-inline-block">Sicap Liberté</span>
+  <span class="province font-weight-bold d-inline-block">Dakar</span>
+  <p class="time-author m-0">Par DS Bikers</p>
+  {extra}
+</div>
+"""
+
+
+def extract(extra=''):
+    card = BeautifulSoup(CARD.format(extra=extra), 'html.parser').div
+    return dict(zip(MOTORCYCLES.columns, MOTORCYCLES.extract(card)))
+
+
+def test_link_found_whatever_the_anchor_class():
+    row = extract('<a class="btn" href="/favoris">Favori</a>')
+    assert row['annonce'] == '139070'
+    assert row['lien'] == '/senegal/motos/bmw/gs/annonce-139070'
+
+
+def test_card_without_link_is_reported():
+    card = BeautifulSoup(CARD.format(extra='').replace('annonce-139070', 'profil'), 'html.parser').div
+    row = MOTORCYCLES.extract(card)
+    assert row[MOTORCYCLES.columns.index('annonce')] == MISSING
+
+    page = PageResult(1, FetchResult(1, None, None, None, 0.0), [row], [])
+    assert ('warning', "Page 1 : 1 annonce(s) sans lien, non enregistrée(s).") in page_messages(MOTORCYCLES, page)
@@ -0,0 +1,44 @@
+import io
+
+import requests
+
+import scraper.session as session
+from scraper.fetch import HostLimiter
+from scraper.session import HttpClient
+
+
+def response(status):
+    r = requests.Response()
+    r.status_code = status
+    r._content = b''
+    r.raw = io.BytesIO()
+    return r
+
+
+def test_retries_take_a_token_and_release_the_host_during_backoff(monkeypatch):
+    client = HttpClient(retries=2, backoff=0)
+    statuses = iter([503, 502, 200])
+    monkeypatch.setattr(client.session, 'get', lambda url, **kwargs: response(next(statuses)))
+
+    limiter = HostLimiter(concurrency=1, rate=100)
+    semaphore, bucket = limiter._for_host('dakar-auto.com')
+    acquired = []
+    monkeypatch.setattr(bucket, 'acquire', lambda: acquired.append(1))
+
+    def sleep(seconds):
+        # Pendant le backoff, la place de l'hôte est libre
+        assert semaphore.acquire(blocking=False)
+        semaphore.release()
+    monkeypatch.setattr(session.time, 'sleep', sleep)
+
+    result, error, elapsed = limiter.run('https://dakar-auto.com/senegal/voitures-4', client.get)
+
+    assert error is None and result.status_code == 200
+    assert len(acquired) == 3
+
+
+def test_plain_fetch_functions_run_in_a_single_slot():
+    limiter = HostLimiter(concurrency=1, rate=0)
+    result, error, elapsed = limiter.run('https://dakar-auto.com/', lambda url: url.upper())
+    assert (result, error) == ('HTTPS://DAKAR-AUTO.COM/', None)
+    assert elapsed >= 0
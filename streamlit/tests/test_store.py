@@ -0,0 +1,36 @@
+import pandas as pd
+
+from scraper.clean import clean_listings
+from scraper.schema import MISSING
+from scraper.store import ListingStore
+
+
+def listings(*rows):
+    return clean_listings(pd.DataFrame(rows, columns=['marque', 'prix', 'annonce', 'lien']))
+
+
+def test_upsert_skips_listings_without_id(tmp_path):
+    store = ListingStore(tmp_path / 'listings.sqlite')
+    df = listings(
+        ('Ford', '4 300 F CFA', MISSING, MISSING),
+        ('BMW', '2 500 000 F CFA', MISSING, MISSING),
+        ('Kia', '1 000 000 F CFA', '139302', 'https://dakar-auto.com/annonce-139302'),
+        ('Audi', '900 000 F CFA', None, None),
+    )
+
+    assert store.upsert('vehicles', df) == 1
+    stored = store.query('vehicles')
+    assert stored['annonce'].tolist() == ['139302']
+    assert store.price_history('vehicles', MISSING).empty
+    store.close()
+
+
+def test_upsert_updates_price_history(tmp_path):
+    store = ListingStore(tmp_path / 'listings.sqlite')
+    store.upsert('vehicles', listings(('Kia', '1 000 000', '1', 'https://dakar-auto.com/annonce-1')))
+    store.upsert('vehicles', listings(('Kia', '1 000 000', '1', 'https://dakar-auto.com/annonce-1')))
+    store.upsert('vehicles', listings(('Kia', '900 000', '1', 'https://dakar-auto.com/annonce-1')))
+
+    assert len(store.query('vehicles')) == 1
+    assert store.price_history('vehicles', '1')['prix'].tolist() == [1000000, 900000]
+    store.close()